@@ -0,0 +1,147 @@
+"""Scaling benchmark: experiment1, 2 and 3 over synthetic corpora of growing size.
+
+Corpora and query sets come from common/synthetic.py and are cached in
+--data-dir, so repeated runs only pay for generation once.  Every phase is
+timed and its tracemalloc peak recorded; the results are tabulated and
+written to a CSV for plotting (by default next to the corpora, in
+--data-dir, which is git-ignored).
+"""
+import argparse
+import contextlib
+import csv
+import io
+import os
+import sys
+
+from tabulate import tabulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.instrumentation import get_tracer, span, start_run
+from common.synthetic import generate_dataset
+from experiment1.experiment1 import BooleanRetrieval
+from experiment2.spellcheck import available_engines, create_engine, load_shared_index, load_test_queries
+from experiment3.experiment3 import BSBI
+from experiment3.spimi import SPIMI
+
+EXPERIMENTS = ["exp1", "exp2", "exp3"]
+FIELDS = ["docs", "experiment", "phase", "time", "peak_mb", "items", "detail"]
+
+
+def measure(fn):
+    """Run fn() in a memory-traced span; return (result, seconds, peak MB)."""
+    with span("scaling.phase") as phase_span:
+        result = fn()
+    return result, phase_span.seconds, phase_span.peak_bytes / (1024 * 1024)
+
+
+def row(docs, experiment, phase, elapsed, peak, items, detail=""):
+    return {"docs": docs, "experiment": experiment, "phase": phase, "time": elapsed, "peak_mb": peak, "items": items, "detail": detail}
+
+
+def run_exp1(docs, paths, tokenizer):
+    retrieval, elapsed, peak = measure(lambda: BooleanRetrieval(paths["corpus"], tokenizer=tokenizer))
+    yield row(docs, "exp1", "build", elapsed, peak, docs, f"{len(retrieval.invertedIndex)} terms")
+
+    queries = [item["query"] for item in load_test_queries(paths["bool_queries"])]
+    def retrieve_all():
+        # retrieve() prints its own timing line per query.
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sum(len(retrieval.retrieve(query)) for query in queries)
+    hits, elapsed, peak = measure(retrieve_all)
+    yield row(docs, "exp1", "boolean queries", elapsed, peak, len(queries), f"{hits} hits")
+
+
+def run_exp2(docs, paths, engines, dictionary_path):
+    index, elapsed, peak = measure(lambda: load_shared_index(dictionary_path, paths["corpus"]))
+    yield row(docs, "exp2", "shared index", elapsed, peak, docs, f"{len(index.word_to_docs)} corpus words")
+
+    queries = load_test_queries(paths["spell_queries"])
+    for name in engines:
+        engine, elapsed, peak = measure(lambda: create_engine(name, index))
+        yield row(docs, "exp2", f"{name} load", elapsed, peak, 1)
+        corrected, elapsed, peak = measure(lambda: engine.correct_batch([item["query"] for item in queries]))
+        accuracy = sum(c == item["corrected"] for c, item in zip(corrected, queries)) / len(queries)
+        yield row(docs, "exp2", f"{name} correct", elapsed, peak, len(queries), f"{accuracy * 100:.1f}% accurate")
+
+
+def run_exp3(docs, paths, memory_budget, output_dir):
+    bsbi = BSBI(memory_budget=memory_budget, compression="vbyte")
+    _, elapsed, peak = measure(lambda: bsbi.BSBIndexConstruction(paths["corpus"]))
+    yield row(docs, "exp3", "bsbi build", elapsed, peak, docs, f"{len(bsbi.block_files)} blocks")
+
+    spimi = SPIMI(memory_budget, output_dir=output_dir, compression="vbyte")
+    _, elapsed, peak = measure(lambda: spimi.SPIMIndexConstruction(paths["corpus"]))
+    yield row(docs, "exp3", "spimi build", elapsed, peak, docs, f"{len(spimi.block_files)} blocks")
+
+
+def print_table(rows):
+    table = [[r["docs"], r["experiment"], r["phase"], f"{r['time']:.3f}", f"{r['peak_mb']:.2f}",
+              f"{r['time'] / r['items'] * 1000:.3f}", r["detail"]] for r in rows]
+    print(tabulate(table, headers=["Docs", "Experiment", "Phase", "Time (s)", "Peak (MB)", "ms / item", "Detail"]))
+
+
+def print_growth(rows):
+    # How each phase scales: time and memory relative to the smallest corpus.
+    first = {}
+    table = []
+    for r in rows:
+        key = (r["experiment"], r["phase"])
+        base = first.setdefault(key, r)
+        if base is r:
+            continue
+        size_ratio = r["docs"] / base["docs"]
+        table.append([r["experiment"], r["phase"], f"{base['docs']} -> {r['docs']}", f"{size_ratio:.0f}x",
+                      f"{r['time'] / base['time']:.1f}x" if base["time"] else "-",
+                      f"{r['peak_mb'] / base['peak_mb']:.1f}x" if base["peak_mb"] else "-"])
+    if table:
+        print(tabulate(table, headers=["Experiment", "Phase", "Docs", "Size", "Time", "Peak memory"]))
+
+
+def write_csv(path, rows):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run experiments 1-3 over synthetic corpora of increasing size.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 100000], help="corpus sizes in documents")
+    parser.add_argument("--experiments", nargs="+", choices=EXPERIMENTS, default=EXPERIMENTS)
+    parser.add_argument("--engines", nargs="+", choices=available_engines(), default=["ngram", "hybrid"])
+    parser.add_argument("--tokenizer", default="split", help="experiment1 tokenizer (spacy is far slower at scale)")
+    parser.add_argument("--queries", type=int, default=200, help="Boolean and misspelled queries per run")
+    parser.add_argument("--memory-budget", type=float, default=16, help="experiment3 block memory budget in MB")
+    parser.add_argument("--dictionary", default="dictionary.txt")
+    parser.add_argument("--data-dir", default="Assignment-data/synthetic")
+    parser.add_argument("--output", default=None, help="results CSV (default: scaling_results.csv in --data-dir)")
+    args = parser.parse_args(argv)
+    output = args.output or os.path.join(args.data_dir, "scaling_results.csv")
+    if not get_tracer().memory:
+        start_run("scaling", memory=True)
+
+    rows = []
+    for docs in args.sizes:
+        paths = generate_dataset(os.path.join(args.data_dir, str(docs)), docs, args.dictionary, args.queries)
+        if "exp1" in args.experiments:
+            rows.extend(run_exp1(docs, paths, args.tokenizer))
+        if "exp2" in args.experiments:
+            rows.extend(run_exp2(docs, paths, args.engines, args.dictionary))
+        if "exp3" in args.experiments:
+            rows.extend(run_exp3(docs, paths, int(args.memory_budget * 1024 * 1024), os.path.join(args.data_dir, str(docs), "spimi")))
+
+    print()
+    print_table(rows)
+    print()
+    print_growth(rows)
+    write_csv(output, rows)
+    print(f"\nResults written to {output}")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Benchmark history: an append-only JSONL file of benchmark runs.
+
+Each line is one engine benchmarked in one run: the run id, timestamp and
+label, the environment (Python, platform, CPU, memory, git revision) and
+one entry per repeated trial with its timings, latency percentiles, peak
+memory and accuracy.  experiment2/benchmark.py appends to it after every
+run (--repeat N for several trials).
+
+    python common/history.py list
+    python common/history.py compare --baseline <run id | label | previous> [--candidate latest]
+
+compare matches the engines two runs have in common and reports the
+change in every metric's mean.  A change is only called a regression or
+an improvement when Welch's t-test over the trials gives p < --alpha and
+the change exceeds --min-change (for accuracy, any drop); with one trial
+per side there is no test and deltas are shown unflagged.  A metric whose
+baseline mean is 0 has no relative change: its absolute difference is shown
+and flagged on the t-test alone.  The exit
+status is 1 if any regression was flagged.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from common.stats import mean, percentile, variance, welch_t_test
+
+DEFAULT_HISTORY = "experiment2/benchmark_history.jsonl"
+# metric -> whether larger values are better
+METRICS = {
+    "total_time": False,
+    "average_time": False,
+    "p50_ms": False,
+    "p90_ms": False,
+    "p99_ms": False,
+    "peak_memory_bytes": False,
+    "accuracy": True,
+}
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def environment():
+    import psutil
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "total_memory_bytes": psutil.virtual_memory().total,
+        "git": git_revision(),
+    }
+
+
+def new_run_id():
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + os.urandom(2).hex()
+
+
+def latency_summary(sorted_seconds):
+    """Percentiles (in ms) of an ascending sequence of per-query times."""
+    return {
+        "p50_ms": percentile(sorted_seconds, 0.50) * 1000,
+        "p90_ms": percentile(sorted_seconds, 0.90) * 1000,
+        "p99_ms": percentile(sorted_seconds, 0.99) * 1000,
+        "max_ms": (sorted_seconds[-1] if len(sorted_seconds) else 0) * 1000,
+    }
+
+
+def append_entry(path, entry):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(entry) + "\n")
+
+
+def load_history(path):
+    entries = []
+    try:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    entries.append(json.loads(line))
+    except FileNotFoundError:
+        print(f"Error: Could not find file {path}")
+    return entries
+
+
+def runs(entries):
+    """Run ids in the order they were appended, each with its entries."""
+    grouped = {}
+    for entry in entries:
+        grouped.setdefault(entry["run_id"], []).append(entry)
+    return grouped
+
+
+def resolve_run(grouped, reference):
+    """A run id from 'latest', 'previous', a run id (prefix) or a label (latest wins)."""
+    ids = list(grouped)
+    if not ids:
+        raise ValueError("The history is empty")
+    if reference == "latest":
+        return ids[-1]
+    if reference == "previous":
+        if len(ids) < 2:
+            raise ValueError("The history has only one run")
+        return ids[-2]
+    for run_id in reversed(ids):
+        if run_id.startswith(reference) or grouped[run_id][0].get("label") == reference:
+            return run_id
+    raise ValueError(f"No run matches '{reference}'")
+
+
+def entry_key(entry):
+    return entry["benchmark"], entry["engine"], entry["mode"], entry["queries"]
+
+
+def compare_entries(baseline, candidate, alpha=0.05, min_change=0.05):
+    rows = []
+    for metric, higher_is_better in METRICS.items():
+        before = [trial[metric] for trial in baseline["trials"] if metric in trial]
+        after = [trial[metric] for trial in candidate["trials"] if metric in trial]
+        if not before or not after:
+            continue
+        difference = mean(after) - mean(before)
+        change = difference / mean(before) if mean(before) else None
+        _, p = welch_t_test(before, after)
+        worse = difference < 0 if higher_is_better else difference > 0
+        verdict = ""
+        # Accuracy does not vary between trials, so any significant drop counts.
+        minimum = 0 if higher_is_better else min_change
+        if p is not None and p < alpha and difference != 0 and (change is None or abs(change) >= minimum):
+            verdict = "REGRESSION" if worse else "improved"
+        rows.append({"engine": candidate["engine"], "mode": candidate["mode"], "metric": metric,
+                     "baseline": mean(before), "baseline_sd": variance(before) ** 0.5,
+                     "candidate": mean(after), "candidate_sd": variance(after) ** 0.5,
+                     "change": change, "difference": difference, "p": p, "trials": f"{len(before)}/{len(after)}", "verdict": verdict})
+    return rows
+
+
+def compare_runs(grouped, baseline_id, candidate_id, alpha=0.05, min_change=0.05):
+    baseline = {entry_key(entry): entry for entry in grouped[baseline_id]}
+    rows = []
+    for entry in grouped[candidate_id]:
+        if entry_key(entry) in baseline:
+            rows.extend(compare_entries(baseline[entry_key(entry)], entry, alpha, min_change))
+    return rows
+
+
+def describe(entry):
+    env = entry.get("env", {})
+    return f"{entry['run_id']} {entry['timestamp']} {entry.get('label') or '-'} git {env.get('git') or '?'} python {env.get('python', '?')}"
+
+
+def list_command(args):
+    from tabulate import tabulate
+    table = []
+    for run_id, entries in runs(load_history(args.history)).items():
+        first = entries[0]
+        table.append([run_id, first["timestamp"], first.get("label") or "", first.get("env", {}).get("git") or "",
+                      ", ".join(f"{entry['engine']} ({entry['mode']}, {len(entry['trials'])}x)" for entry in entries)])
+    print(tabulate(table, headers=["Run", "Time", "Label", "Git", "Engines (mode, trials)"]))
+    return 0
+
+
+def compare_command(args):
+    from tabulate import tabulate
+    grouped = runs(load_history(args.history))
+    try:
+        baseline_id = resolve_run(grouped, args.baseline)
+        candidate_id = resolve_run(grouped, args.candidate)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 2
+    print(f"Baseline:  {describe(grouped[baseline_id][0])}")
+    print(f"Candidate: {describe(grouped[candidate_id][0])}\n")
+
+    rows = compare_runs(grouped, baseline_id, candidate_id, args.alpha, args.min_change)
+    if not rows:
+        print("The runs have no engine, mode and query set in common.")
+        return 2
+    print(tabulate([[row["engine"], row["mode"], row["metric"],
+                     f"{row['baseline']:.6g} ± {row['baseline_sd']:.2g}", f"{row['candidate']:.6g} ± {row['candidate_sd']:.2g}",
+                     f"{row['difference']:+.6g} (abs)" if row["change"] is None else f"{row['change'] * 100:+.1f}%", "n/a" if row["p"] is None else f"{row['p']:.3g}", row["trials"], row["verdict"]]
+                    for row in rows],
+                   headers=["Engine", "Mode", "Metric", "Baseline", "Candidate", "Change", "p", "Trials", "Verdict"]))
+    regressions = sum(row["verdict"] == "REGRESSION" for row in rows)
+    print(f"\n{regressions} significant regression(s) at alpha={args.alpha}, min change {args.min_change * 100:.0f}%")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List benchmark history and compare runs.")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list recorded runs")
+    compare = commands.add_parser("compare", help="compare a run against a baseline run")
+    compare.add_argument("--baseline", default="previous", help="run id (prefix), label, 'previous' or 'latest'")
+    compare.add_argument("--candidate", default="latest")
+    compare.add_argument("--alpha", type=float, default=0.05, help="significance level of the t-test")
+    compare.add_argument("--min-change", type=float, default=0.05, help="smallest relative change worth flagging")
+    args = parser.parse_args(argv)
+    return list_command(args) if args.command == "list" else compare_command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
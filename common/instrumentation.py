@@ -0,0 +1,300 @@
+"""Spans, counters and memory snapshots for timing the experiments.
+
+Code under measurement opens nested spans and bumps counters on the
+process-wide tracer::
+
+    with span("bsbi.invert"):
+        ...
+        count("postings", n)
+
+Spans are timed with perf_counter_ns.  When memory tracing is on, each span
+also records its tracemalloc peak (allocations above what was live when it
+opened); otherwise the RSS before and after is kept.  A trace is written as
+JSON or CSV, either by a script's --trace option or for any run by setting
+IR_TRACE=trace.json (IR_TRACE_MEMORY=1 adds tracemalloc).
+
+psutil, tracemalloc and the output modules are imported on first use, so
+importing this module adds next to nothing to a script's startup.
+"""
+import atexit
+from contextlib import contextmanager
+import os
+import sys
+import threading
+import time
+
+# Raw span records kept per run; aggregates keep counting past this.
+MAX_RECORDS = 100000
+
+
+class Span:
+    __slots__ = ("name", "path", "depth", "start_ns", "end_ns", "counters",
+                 "attrs", "start_rss", "end_rss", "start_traced", "end_traced", "peak_traced")
+
+    def __init__(self, name, path, depth, attrs):
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.attrs = attrs
+        self.counters = {}
+        self.start_ns = self.end_ns = 0
+        self.start_rss = self.end_rss = None
+        self.start_traced = self.end_traced = self.peak_traced = None
+
+    @property
+    def duration_ns(self):
+        return (self.end_ns or time.perf_counter_ns()) - self.start_ns
+
+    @property
+    def seconds(self):
+        return self.duration_ns / 1e9
+
+    @property
+    def peak_bytes(self):
+        """tracemalloc peak above the allocations live at span start, if traced."""
+        if self.peak_traced is None:
+            return None
+        return max(0, self.peak_traced - self.start_traced)
+
+    @property
+    def current_bytes(self):
+        """Traced allocations still live at span end, if traced."""
+        if self.end_traced is None:
+            return None
+        return self.end_traced - self.start_traced
+
+    @property
+    def rss_delta(self):
+        if self.end_rss is None:
+            return None
+        return self.end_rss - self.start_rss
+
+    def memory_summary(self):
+        if self.peak_bytes is not None:
+            return f"Peak allocated: {self.peak_bytes / (1024 * 1024):.3f} MB"
+        return f"RSS delta: {self.rss_delta / (1024 * 1024):.3f} MB"
+
+    def record(self, origin_ns):
+        return {
+            "path": self.path,
+            "name": self.name,
+            "depth": self.depth,
+            "start_ms": (self.start_ns - origin_ns) / 1e6,
+            "duration_ms": self.duration_ns / 1e6,
+            "peak_bytes": self.peak_bytes,
+            "rss_delta": self.rss_delta,
+            **self.attrs,
+            **self.counters,
+        }
+
+
+class Tracer:
+    def __init__(self, run="run", memory=False, max_records=MAX_RECORDS):
+        self.run = run
+        self.memory = memory
+        self.max_records = max_records
+        self._process = None
+        self.origin_ns = time.perf_counter_ns()
+        # Each thread nests its own spans; records and aggregates are shared.
+        self.local = threading.local()
+        self.records = []
+        self.dropped = 0
+        # path -> [calls, total ns, min ns, max ns, counters]
+        self.aggregates = {}
+        self.totals = {}
+        self.snapshots = []
+        if memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    @property
+    def process(self):
+        if self._process is None:
+            import psutil
+            self._process = psutil.Process(os.getpid())
+        return self._process
+
+    @property
+    def stack(self):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name, **attrs):
+        stack = self.stack
+        parent = stack[-1] if stack else None
+        current = Span(name, f"{parent.path}/{name}" if parent else name, len(stack), attrs)
+        if self.memory:
+            import tracemalloc
+            # Fold the peak reached so far into the parent before resetting it.
+            current.start_traced, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent.peak_traced = max(parent.peak_traced, peak)
+            tracemalloc.reset_peak()
+            current.peak_traced = current.start_traced
+        else:
+            current.start_rss = self.process.memory_info().rss
+        stack.append(current)
+        current.start_ns = time.perf_counter_ns()
+        try:
+            yield current
+        finally:
+            current.end_ns = time.perf_counter_ns()
+            stack.pop()
+            if self.memory:
+                current.end_traced, peak = tracemalloc.get_traced_memory()
+                current.peak_traced = max(current.peak_traced, peak)
+                if parent is not None:
+                    parent.peak_traced = max(parent.peak_traced, current.peak_traced)
+            else:
+                current.end_rss = self.process.memory_info().rss
+            self.finish(current)
+
+    def finish(self, current):
+        duration = current.duration_ns
+        aggregate = self.aggregates.get(current.path)
+        if aggregate is None:
+            aggregate = self.aggregates[current.path] = [0, 0, duration, duration, {}]
+        aggregate[0] += 1
+        aggregate[1] += duration
+        aggregate[2] = min(aggregate[2], duration)
+        aggregate[3] = max(aggregate[3], duration)
+        for counter, value in current.counters.items():
+            aggregate[4][counter] = aggregate[4].get(counter, 0) + value
+        if len(self.records) < self.max_records:
+            self.records.append(current.record(self.origin_ns))
+        else:
+            self.dropped += 1
+
+    def count(self, name, value=1):
+        """Add value to counter name on the innermost open span and the run totals."""
+        stack = self.stack
+        if stack:
+            counters = stack[-1].counters
+            counters[name] = counters.get(name, 0) + value
+        self.totals[name] = self.totals.get(name, 0) + value
+
+    def snapshot(self, label, top=10):
+        """Record the top allocation sites by line; needs memory tracing."""
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return None
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:top]
+        entry = {
+            "label": label,
+            "at_ms": (time.perf_counter_ns() - self.origin_ns) / 1e6,
+            "top": [{"site": str(stat.traceback), "size": stat.size, "count": stat.count} for stat in stats],
+        }
+        self.snapshots.append(entry)
+        return entry
+
+    def summary(self):
+        """Per-path rows: calls, total/self/min/max ms and summed counters."""
+        child_ns = {}
+        for path, aggregate in self.aggregates.items():
+            parent = path.rpartition("/")[0]
+            if parent:
+                child_ns[parent] = child_ns.get(parent, 0) + aggregate[1]
+        return [{
+            "path": path,
+            "calls": calls,
+            "total_ms": total / 1e6,
+            "self_ms": (total - child_ns.get(path, 0)) / 1e6,
+            "min_ms": low / 1e6,
+            "max_ms": high / 1e6,
+            **counters,
+        } for path, (calls, total, low, high, counters) in sorted(self.aggregates.items())]
+
+    def report(self, file=sys.stdout):
+        rows = self.summary()
+        if not rows:
+            return
+        width = max(len(row["path"]) for row in rows)
+        print(f"{'Span':<{width}} {'Calls':>7} {'Total ms':>11} {'Self ms':>11} {'Max ms':>10}  Counters", file=file)
+        for row in rows:
+            counters = ", ".join(f"{key}={value}" for key, value in row.items()
+                                 if key not in ("path", "calls", "total_ms", "self_ms", "min_ms", "max_ms"))
+            print(f"{row['path']:<{width}} {row['calls']:>7} {row['total_ms']:>11.3f} {row['self_ms']:>11.3f} {row['max_ms']:>10.3f}  {counters}", file=file)
+
+    def to_dict(self):
+        import platform
+        return {
+            "run": self.run,
+            "started": time.time() - (time.perf_counter_ns() - self.origin_ns) / 1e9,
+            "python": platform.python_version(),
+            "memory_tracing": self.memory,
+            "totals": self.totals,
+            "summary": self.summary(),
+            "spans": self.records,
+            "dropped_spans": self.dropped,
+            "snapshots": self.snapshots,
+        }
+
+    def write(self, path):
+        """Write the trace as CSV (one row per span) or, for any other extension, JSON."""
+        import csv
+        import json
+        if path.endswith(".csv"):
+            fields = list(dict.fromkeys(key for record in self.records for key in record))
+            with open(path, "w", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(self.records)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(self.to_dict(), file, indent=1)
+
+
+# Until a run asks for a trace nothing would ever write raw records, and
+# long builds would only accumulate them, so the default keeps aggregates.
+_tracer = Tracer(max_records=0)
+
+
+def get_tracer():
+    return _tracer
+
+
+def start_run(run="run", memory=False, max_records=MAX_RECORDS):
+    """Replace the process-wide tracer with a fresh one.
+
+    max_records=0 keeps only aggregates, for long runs that write no trace.
+    """
+    global _tracer
+    _tracer = Tracer(run, memory, max_records)
+    return _tracer
+
+
+def span(name, **attrs):
+    return _tracer.span(name, **attrs)
+
+
+def count(name, value=1):
+    _tracer.count(name, value)
+
+
+def snapshot(label, top=10):
+    return _tracer.snapshot(label, top)
+
+
+def write_trace(path):
+    _tracer.write(path)
+
+
+def add_trace_arguments(parser):
+    parser.add_argument("--trace", default=None, help="write a span trace to this .json or .csv file")
+    parser.add_argument("--trace-memory", action="store_true", help="record tracemalloc peaks per span (slower)")
+
+
+def configure_from_args(args, run):
+    """Start a run for a script's --trace options; returns the trace path."""
+    if args.trace or args.trace_memory:
+        start_run(run, args.trace_memory)
+    return args.trace
+
+
+if os.environ.get("IR_TRACE"):
+    start_run(os.path.basename(sys.argv[0]) or "run", os.environ.get("IR_TRACE_MEMORY") == "1")
+    atexit.register(lambda: write_trace(os.environ["IR_TRACE"]))
@@ -0,0 +1,116 @@
+"""Deep sizes of in-memory structures, split into payload and overhead.
+
+Payload is the raw data a compact representation could not avoid storing:
+UTF-8 text of strings, bytes, 8 bytes per int or float reference (a docID
+repeated across postings lists is payload in each), and array buffers,
+numpy's included (a view's buffer is charged to the array it views).
+Everything else (object headers, hash tables, list slot arrays, per-object
+bookkeeping) is overhead.  Every object is counted once per traversal, so a
+word shared between a list and a set is charged to whichever is walked first.
+"""
+from array import array
+from collections import deque, namedtuple
+import io
+import sys
+import types
+
+Size = namedtuple("Size", ["total", "payload", "objects"])
+
+# Never traversed: their referents are code and interpreter state, not data.
+OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                types.MethodType, io.IOBase, memoryview)
+ITEM_CONTAINERS = (list, tuple, set, frozenset, deque)
+
+
+def is_ndarray(obj):
+    # Checked by name so that sizing never imports numpy.
+    return any(cls.__name__ == "ndarray" and cls.__module__ == "numpy" for cls in type(obj).__mro__)
+
+
+def payload_bytes(obj):
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8", "surrogatepass"))
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, array):
+        return obj.itemsize * len(obj)
+    if is_ndarray(obj) and obj.base is None:
+        return obj.nbytes
+    return 0
+
+
+def deep_size(*roots, seen=None, skip=()):
+    """Size of everything reachable from roots, leaving out ids in seen or skip."""
+    seen = set() if seen is None else seen
+    seen.update(skip)
+    total = payload = objects = 0
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, (int, float)) and not isinstance(obj, bool):
+            payload += 8
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        payload += payload_bytes(obj)
+        objects += 1
+
+        if isinstance(obj, OPAQUE_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, ITEM_CONTAINERS):
+            stack.extend(obj)
+        elif is_ndarray(obj):
+            if obj.base is not None:
+                stack.append(obj.base)
+        elif not isinstance(obj, (str, bytes, bytearray, int, float, array)):
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return Size(total, payload, objects)
+
+
+class MemoryReport:
+    """Per-structure deep sizes.
+
+    Each row carries the structure's standalone size and its exclusive size,
+    i.e. what it adds on top of the rows before it, so the exclusive column
+    sums to the real footprint of everything reported.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.seen = set()
+
+    def add(self, name, *roots, skip=()):
+        skip_ids = [id(obj) for obj in skip]
+        standalone = deep_size(*roots, skip=skip_ids)
+        # Skipped objects stay available to later rows.
+        unseen = [i for i in skip_ids if i not in self.seen]
+        exclusive = deep_size(*roots, seen=self.seen, skip=skip_ids)
+        self.seen.difference_update(unseen)
+        self.rows.append((name, standalone, exclusive))
+        return standalone
+
+    @property
+    def total(self):
+        return sum(exclusive.total for _, _, exclusive in self.rows)
+
+    def print(self, title="Memory accounting"):
+        from tabulate import tabulate
+
+        def mb(value):
+            return f"{value / (1024 * 1024):.3f}"
+
+        table = [[name, size.objects, mb(size.total), mb(size.payload), mb(size.total - size.payload),
+                  f"{(size.total - size.payload) / size.total * 100:.1f}" if size.total else "-", mb(exclusive.total)]
+                 for name, size, exclusive in self.rows]
+        table.append(["total (exclusive)", "", "", "", "", "", mb(self.total)])
+        print(f"\n{title}")
+        print(tabulate(table, headers=["Structure", "Objects", "Total (MB)", "Payload (MB)", "Overhead (MB)", "Overhead %", "Exclusive (MB)"]))
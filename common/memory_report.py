@@ -0,0 +1,64 @@
+"""Deep-size the main structures of experiments 1-3 after building them.
+
+Unlike the RSS deltas printed by the experiments, the figures exclude the
+interpreter, the spaCy model and JSON parse buffers, and split each
+structure into payload and container overhead.
+"""
+import argparse
+import os
+import sys
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.memory import MemoryReport
+from experiment1.experiment1 import BooleanRetrieval
+from experiment2.spellcheck import available_engines, create_engine, load_shared_index
+from experiment3.experiment3 import BSBI
+
+EXPERIMENTS = ["exp1", "exp2", "exp3"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report exact per-structure memory use of the experiment indexes.")
+    parser.add_argument("--experiments", nargs="+", choices=EXPERIMENTS, default=EXPERIMENTS)
+    parser.add_argument("--docs", default="Assignment-data/bool_docs.json", help="experiment1/2 corpus")
+    parser.add_argument("--bsbi-docs", default="Assignment-data/bsbi_docs.json", help="experiment3 corpus")
+    parser.add_argument("--dictionary", default="dictionary.txt")
+    parser.add_argument("--tokenizer", default="spacy", help="experiment1 tokenizer")
+    parser.add_argument("--index", default=None, help="report experiment1's disk index in this directory instead of building one")
+    parser.add_argument("--engines", nargs="+", choices=available_engines(), default=available_engines(),
+                        help="experiment2 engines whose lexicon views are built before reporting")
+    parser.add_argument("--block-size", type=int, default=100000, help="experiment3 BSBI block size in postings")
+    args = parser.parse_args(argv)
+
+    process = psutil.Process(os.getpid())
+    baseline_rss = process.memory_info().rss
+    report = MemoryReport()
+
+    if "exp1" in args.experiments:
+        if args.index:
+            retrieval = BooleanRetrieval(index_dir=args.index)
+        else:
+            retrieval = BooleanRetrieval(args.docs, tokenizer=args.tokenizer)
+        retrieval.memory_structures(report)
+
+    if "exp2" in args.experiments:
+        index = load_shared_index(args.dictionary, args.docs)
+        for name in args.engines:
+            create_engine(name, index)
+        index.memory_structures(report)
+
+    if "exp3" in args.experiments:
+        bsbi = BSBI(args.block_size)
+        bsbi.BSBIndexConstruction(args.bsbi_docs)
+        bsbi.memory_structures(report)
+
+    report.print()
+    print(f"\nProcess RSS growth over the same builds: {(process.memory_info().rss - baseline_rss) / (1024 * 1024):.3f} MB")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Cold-start cost of the entry points.
+
+Runs each module import in a fresh interpreter under ``python -X importtime``
+and breaks the time down by imported module, then times complete cold
+invocations, most importantly "load a disk index and run one query".
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_MODULES = [
+    "experiment1.experiment1",
+    "experiment2.spellcheck",
+    "experiment2.benchmark",
+    "experiment3.experiment3",
+    "common.instrumentation",
+]
+
+
+def import_times(module):
+    """(self us, cumulative us, depth, name) for every module imported by module."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def print_breakdown(module, top):
+    rows = import_times(module)
+    total = next(cumulative for _, cumulative, _, name in reversed(rows) if name == module)
+    print(f"\n{module}: {total / 1000:.1f} ms to import")
+    print(f"  {'Module':<40} {'Self (ms)':>10} {'Cumulative (ms)':>16}")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda row: -row[0])[:top]:
+        print(f"  {name:<40} {self_us / 1000:>10.1f} {cumulative_us / 1000:>16.1f}")
+    return total
+
+
+def time_command(command, runs):
+    times = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start_time)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Break down import time and time cold starts of the entry points.")
+    parser.add_argument("--modules", nargs="+", default=ENTRY_MODULES)
+    parser.add_argument("--top", type=int, default=8, help="modules with the largest self time to list per entry point")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per command; the median is reported")
+    parser.add_argument("--index", default="experiment3/writtenBlocks", help="disk index for the query cold start (see experiment3.py --retrieval-index)")
+    parser.add_argument("--query", default="flow AND pressure")
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        print_breakdown(module, args.top)
+
+    commands = [("interpreter only", [sys.executable, "-c", "pass"])]
+    if os.path.exists(os.path.join(REPO_ROOT, args.index, "blockMerged.dict")):
+        commands.append(("load index, run one query",
+                         [sys.executable, "experiment1/experiment1.py", "--index", args.index, "--query", args.query]))
+    else:
+        print(f"\nNo compressed index in {args.index}; skipping the query cold start.")
+
+    print(f"\n{'Cold start':<28} {'Median (ms)':>12}")
+    for label, command in commands:
+        print(f"{label:<28} {time_command(command, args.runs) * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Small statistics helpers for the benchmarks (no SciPy needed)."""
+import math
+
+
+def percentile(sorted_values, fraction):
+    """Linearly interpolated percentile of an already sorted sequence."""
+    if not len(sorted_values):
+        return 0.0
+    rank = fraction * (len(sorted_values) - 1)
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def variance(values):
+    """Sample variance (n - 1 denominator)."""
+    if len(values) < 2:
+        return 0.0
+    average = mean(values)
+    return sum((value - average) ** 2 for value in values) / (len(values) - 1)
+
+
+def _continued_fraction(a, b, x, iterations=200, epsilon=3e-14):
+    # Lentz's method for the continued fraction of the incomplete beta function.
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, iterations + 1):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1.0) < epsilon:
+            break
+    return result
+
+
+def incomplete_beta(a, b, x):
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _continued_fraction(a, b, x) / a
+    return 1.0 - front * _continued_fraction(b, a, 1 - x) / b
+
+
+def welch_t_test(sample_a, sample_b):
+    """Two-sided Welch's t-test; returns (t, p).
+
+    With fewer than two values on either side the test is undefined and p
+    is None.  Samples without any spread differ with certainty (p = 0)
+    unless their means are equal.
+    """
+    if len(sample_a) < 2 or len(sample_b) < 2:
+        return None, None
+    error_a = variance(sample_a) / len(sample_a)
+    error_b = variance(sample_b) / len(sample_b)
+    difference = mean(sample_b) - mean(sample_a)
+    if error_a + error_b == 0:
+        return (0.0, 1.0) if difference == 0 else (math.copysign(math.inf, difference), 0.0)
+    t = difference / math.sqrt(error_a + error_b)
+    freedom = (error_a + error_b) ** 2 / (
+        (error_a ** 2 / (len(sample_a) - 1) if error_a else 0) + (error_b ** 2 / (len(sample_b) - 1) if error_b else 0))
+    return t, incomplete_beta(freedom / 2, 0.5, freedom / (freedom + t * t))
@@ -0,0 +1,149 @@
+"""Synthetic corpora and query sets in the Assignment-data formats.
+
+Documents use the bool_docs.json / bsbi_docs.json schema (Index, Title,
+Author, Bibliographic Source, Abstract) with words drawn from the dictionary
+under a Zipfian distribution, so term frequencies and posting list lengths
+look like a real collection at any size.  Corpora are written as a stream and
+never held in memory.
+"""
+import argparse
+from itertools import accumulate
+import json
+import os
+import random
+import string
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from experiment2.spellcheck.loaders import load_dictionary
+
+SURNAMES = ["smith", "jones", "taylor", "brown", "wilson", "evans", "thomas", "roberts", "walker", "wright"]
+JOURNALS = ["j. ae. sc.", "j. fluid mech.", "aiaa j.", "arc r and m", "naca tn", "j. appl. mech."]
+QUERY_KINDS = ["term", "and", "or", "not", "nested"]
+
+
+class ZipfVocabulary:
+    """Dictionary words ranked in a seeded random order, rank r drawn with weight 1/r^s."""
+
+    def __init__(self, words, exponent=1.1, seed=0):
+        self.words = sorted(set(words))
+        random.Random(seed).shuffle(self.words)
+        self.cum_weights = list(accumulate(1 / rank ** exponent for rank in range(1, len(self.words) + 1)))
+
+    def sample(self, rng, k):
+        return rng.choices(self.words, cum_weights=self.cum_weights, k=k)
+
+
+def generate_documents(num_docs, vocabulary, seed=0, title_length=8, abstract_length=120):
+    rng = random.Random(seed)
+    for index in range(1, num_docs + 1):
+        authors = " and ".join(f"{rng.choice(SURNAMES)}, {rng.choice(string.ascii_lowercase)}."
+                               for _ in range(rng.randint(1, 3)))
+        abstract = vocabulary.sample(rng, max(1, int(rng.gauss(abstract_length, abstract_length / 4))))
+        yield {
+            "Index": index,
+            "Title": " ".join(vocabulary.sample(rng, title_length)).capitalize(),
+            "Author": authors,
+            "Bibliographic Source": f"{rng.choice(JOURNALS)} {rng.randint(1, 40)}, {rng.randint(1940, 1970)}",
+            "Abstract": " ".join(abstract) + ".",
+        }
+
+
+def write_corpus(path, num_docs, vocabulary, seed=0, **options):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for i, doc in enumerate(generate_documents(num_docs, vocabulary, seed, **options)):
+            file.write(",\n" if i else "\n")
+            json.dump(doc, file)
+        file.write("\n]\n")
+
+
+def generate_boolean_queries(count, vocabulary, seed=0, mix=QUERY_KINDS):
+    """Boolean queries in BooleanRetrieval's syntax, cycling through the query kinds in mix."""
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        kind = mix[i % len(mix)]
+        a, b, c = vocabulary.sample(rng, 3)
+        query = {
+            "term": a,
+            "and": f"{a} AND {b}",
+            "or": f"{a} OR {b}",
+            "not": f"{a} AND NOT {b}",
+            "nested": f"( {a} OR {b} ) AND NOT {c}",
+        }[kind]
+        queries.append({"query": query, "kind": kind})
+    return queries
+
+
+def misspell(word, rng):
+    """Apply one random insertion, deletion, substitution or transposition."""
+    i = rng.randrange(len(word))
+    edit = rng.choice(["insert", "delete", "substitute", "transpose"] if len(word) > 1 else ["insert", "substitute"])
+    letter = rng.choice(string.ascii_lowercase)
+    if edit == "insert":
+        return word[:i] + letter + word[i:]
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    if edit == "substitute":
+        return word[:i] + letter + word[i + 1:]
+    i = min(i, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def generate_spell_queries(count, vocabulary, seed=0, max_words=3, min_length=4):
+    """Misspelled phrases with their known corrections, in the spell_queries.json format.
+
+    Every word of a phrase gets one edit that does not land on another
+    dictionary word, so the expected correction is unambiguous.
+    """
+    rng = random.Random(seed)
+    known = set(vocabulary.words)
+    candidates = ZipfVocabulary([w for w in vocabulary.words if len(w) >= min_length], seed=seed)
+    queries = []
+    while len(queries) < count:
+        words = candidates.sample(rng, rng.randint(1, max_words))
+        misspelled = [misspell(word, rng) for word in words]
+        if any(wrong in known for wrong in misspelled):
+            continue
+        queries.append({"query": " ".join(misspelled), "corrected": " ".join(words)})
+    return queries
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=1)
+
+
+def generate_dataset(out_dir, num_docs, dictionary_path="dictionary.txt", num_queries=200, seed=0, exponent=1.1):
+    """Write corpus_{num_docs}.json, bool_queries.json and spell_queries.json; skip files that exist."""
+    os.makedirs(out_dir, exist_ok=True)
+    vocabulary = ZipfVocabulary(load_dictionary(dictionary_path), exponent, seed)
+    paths = {
+        "corpus": os.path.join(out_dir, f"corpus_{num_docs}.json"),
+        "bool_queries": os.path.join(out_dir, "bool_queries.json"),
+        "spell_queries": os.path.join(out_dir, "spell_queries.json"),
+    }
+    if not os.path.exists(paths["corpus"]):
+        write_corpus(paths["corpus"], num_docs, vocabulary, seed)
+    if not os.path.exists(paths["bool_queries"]):
+        write_json(paths["bool_queries"], generate_boolean_queries(num_queries, vocabulary, seed))
+    if not os.path.exists(paths["spell_queries"]):
+        write_json(paths["spell_queries"], generate_spell_queries(num_queries, vocabulary, seed))
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic corpora and query sets in the Assignment-data formats.")
+    parser.add_argument("--docs", nargs="+", type=int, default=[1000], help="corpus sizes in documents")
+    parser.add_argument("--out-dir", default="Assignment-data/synthetic")
+    parser.add_argument("--dictionary", default="dictionary.txt")
+    parser.add_argument("--queries", type=int, default=200, help="Boolean and misspelled queries to generate")
+    parser.add_argument("--exponent", type=float, default=1.1, help="Zipf exponent of the term distribution")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for num_docs in args.docs:
+        for name, path in generate_dataset(args.out_dir, num_docs, args.dictionary, args.queries, args.seed, args.exponent).items():
+            print(f"{name}: {path}")
@@ -0,0 +1,73 @@
+"""Index agreement and speed of two BooleanRetrieval tokenizers.
+
+Builds the in-memory index once per tokenizer and reports startup (tokenizer
+load) time, indexing throughput, and how far the indexes agree: the Jaccard
+overlap of their term sets and of their (term, docID) postings.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.instrumentation import start_run
+from experiment1.experiment1 import BooleanRetrieval
+from experiment1.tokenizers import DEFAULT_LOOKUP_TABLE, TOKENIZERS, export_lookup_table, get_tokenizer
+
+def buildIndex(filepath, tokenizer):
+    # A fresh tracer per build, so the spans below are this build's only.
+    tracer=start_run(f"tokenizer.{tokenizer}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        retrieval=BooleanRetrieval(filepath,tokenizer=tokenizer)
+    spans={row["path"]: row for row in tracer.summary()}
+    load_ms=spans["exp1.build/tokenizer.load"]["total_ms"]
+    return retrieval, load_ms, spans["exp1.build"]["total_ms"]-load_ms
+
+def indexAgreement(left, right):
+    left_terms=set(left.invertedIndex)
+    right_terms=set(right.invertedIndex)
+    common=left_terms & right_terms
+    shared_postings=sum(len(left.invertedIndex[term]["docs"] & right.invertedIndex[term]["docs"]) for term in common)
+    left_postings=sum(len(data["docs"]) for data in left.invertedIndex.values())
+    right_postings=sum(len(data["docs"]) for data in right.invertedIndex.values())
+    return {
+        "term_jaccard": len(common)/len(left_terms | right_terms) if left_terms or right_terms else 1.0,
+        "posting_jaccard": shared_postings/(left_postings+right_postings-shared_postings) if left_postings or right_postings else 1.0,
+        "only_left": sorted(left_terms-right_terms),
+        "only_right": sorted(right_terms-left_terms),
+    }
+
+if __name__=="__main__":
+    parser=argparse.ArgumentParser(description="Compare the index built by two tokenizers.")
+    parser.add_argument("--docs",default="Assignment-data/bool_docs.json")
+    parser.add_argument("--tokenizers",nargs=2,choices=sorted(TOKENIZERS),default=["spacy","lookup"])
+    parser.add_argument("--export",action="store_true",help=f"first (re)export {os.path.basename(DEFAULT_LOOKUP_TABLE)} from spaCy over --docs")
+    parser.add_argument("--examples",type=int,default=10,help="terms found by only one tokenizer to print")
+    args=parser.parse_args()
+    
+    if args.export:
+        print(f"Exported {export_lookup_table([args.docs])} lemma entries to {DEFAULT_LOOKUP_TABLE}")
+    for name in args.tokenizers:
+        try:
+            get_tokenizer(name)
+        except FileNotFoundError as error:
+            parser.error(str(error))
+    
+    results=[]
+    for name in args.tokenizers:
+        retrieval, load_ms, index_ms=buildIndex(args.docs,name)
+        results.append((name,retrieval,load_ms,index_ms,len(retrieval.documents)))
+    
+    print(f"{'Tokenizer':<10} {'Load (ms)':>10} {'Index (ms)':>11} {'Docs/s':>10} {'Terms':>8} {'Postings':>10}")
+    for name, retrieval, load_ms, index_ms, docs in results:
+        postings=sum(len(data["docs"]) for data in retrieval.invertedIndex.values())
+        print(f"{name:<10} {load_ms:>10.1f} {index_ms:>11.1f} {docs/(index_ms/1000):>10.0f} {len(retrieval.invertedIndex):>8} {postings:>10}")
+    
+    (left, left_index, left_load, left_ms, _), (right, right_index, right_load, right_ms, _)=results
+    agreement=indexAgreement(left_index,right_index)
+    print(f"\nStartup speedup ({left} -> {right}): {left_load/max(right_load,1e-3):.1f}x | Indexing speedup: {left_ms/right_ms:.1f}x")
+    print(f"Term agreement: {agreement['term_jaccard']*100:.2f}% | Posting agreement: {agreement['posting_jaccard']*100:.2f}%")
+    print(f"Only {left}: {', '.join(agreement['only_left'][:args.examples])}")
+    print(f"Only {right}: {', '.join(agreement['only_right'][:args.examples])}")
@@ -0,0 +1,50 @@
+"""\"Did you mean\" for query terms missing from the index.
+
+Candidates come from a bigram index over the index's own term dictionary:
+a term within edit distance d of the query term keeps every bigram that no
+edit touched, and one edit touches at most two, so only terms sharing at
+least |bigrams| - 2d of them (and at least one) are checked with a bounded
+Levenshtein distance.  The closest terms win, ties going to the higher df.
+Requiring a shared bigram only loses matches that are single letters or
+two edits away from a term of three letters or fewer.
+"""
+from experiment1.wildcard import KGramIndex
+
+
+def levenshtein(a, b, limit):
+    """Unit-cost edit distance, or limit + 1 once it must exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class SpellingCorrector:
+    def __init__(self, terms, max_distance=2):
+        self.max_distance = max_distance
+        self.bigrams = KGramIndex(terms, k=2)
+
+    def suggestions(self, term, df, limit=5):
+        """Up to limit (distance, term) pairs, closest and most frequent first."""
+        threshold = max(1, len(self.bigrams.grams(term)) - 2 * self.max_distance)
+        scored = []
+        for term_id, shared in self.bigrams.overlap_counts(term).items():
+            if shared < threshold:
+                continue
+            candidate = self.bigrams.terms[term_id]
+            distance = levenshtein(term, candidate, self.max_distance)
+            if distance <= self.max_distance:
+                scored.append((distance, -df(candidate), candidate))
+        scored.sort()
+        return [(distance, candidate) for distance, _, candidate in scored[:limit]]
+
+    def correct(self, term, df):
+        suggestions = self.suggestions(term, df, limit=1)
+        return suggestions[0][1] if suggestions else None
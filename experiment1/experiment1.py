@@ -1,33 +1,78 @@
 from collections import defaultdict
-import ijson
+import argparse
 import os
-import psutil
-import spacy
-import time
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.instrumentation import add_trace_arguments, configure_from_args, count, span, write_trace
+from experiment1.tokenizers import TOKENIZERS, get_tokenizer
+from experiment1.correction import SpellingCorrector
+from experiment1.wildcard import KGramIndex
+from experiment3.corpus import RETRIEVAL_FIELDS
+from experiment3.docstore import DocumentStore
+from experiment3.postings import CompressedIndex
 
 class BooleanRetrieval:
-    def __init__(self, filepath):
+    def __init__(self, filepath=None, index_dir=None, tokenizer="spacy", memory_budget=None, spill_dir=None, max_wildcard_expansions=50, spell_correct=True):
+        # With index_dir, load a disk index written by experiment3 with
+        # --retrieval-index instead of building one: only the term dictionary
+        # and docIDs are resident, postings are decoded per query term.
+        # With memory_budget (bytes), postings are spilled to sorted runs in
+        # spill_dir (a temporary directory by default) whenever they outgrow
+        # the budget, merged into such an index at the end and queried from
+        # disk. The budget only sizes the runs; going over it is reported,
+        # not fatal.
+        # Wildcard terms ("aero*", "*elastic") expand to an OR over at most
+        # max_wildcard_expansions dictionary terms, the most frequent first.
+        # With spell_correct, terms missing from the index are replaced by
+        # the closest, most frequent dictionary term ("did you mean").
         self.documents={}
-        self.initial_memory = psutil.Process().memory_info().rss / (1024 * 1024)
+        self.diskIndex=None
+        self.documentStore=None
+        self.universe=None
+        self.wildcardIndex=None
+        self.max_wildcard_expansions=max_wildcard_expansions
+        self.spell_correct=spell_correct
+        self.spellingCorrector=None
+        self.corrections={}
+        self.spillDir=None
         self.invertedIndex=defaultdict(lambda:{"df":0,"docs":set()})
-        self.nlp=spacy.load("en_core_web_sm")
-        start_time=time.time()
-        
-        self.build_index(filepath)
         
-        end_time=time.time()
-        self.current_memory = psutil.Process().memory_info().rss / (1024*1024)
+        if index_dir:
+            with span("exp1.load") as build_span:
+                self.load_disk_index(index_dir)
+            stage="Inverted Index Load"
+        elif memory_budget:
+            from experiment3.spimi import SPIMI
+            if spill_dir is None:
+                # Removed with this object; the index is read from it lazily.
+                self.spillDir=tempfile.TemporaryDirectory(prefix="exp1-spill-")
+                spill_dir=self.spillDir.name
+            with span("exp1.build",mode="spill") as build_span:
+                spimi=SPIMI(memory_budget,output_dir=spill_dir,tolerance=None,compression="vbyte",tokenizer=tokenizer,fields=RETRIEVAL_FIELDS)
+                spimi.SPIMIndexConstruction(filepath)
+                self.load_disk_index(spill_dir)
+            stage=f"Inverted Index Construction ({len(spimi.block_files)} spilled runs)"
+        else:
+            with span("exp1.build",mode="memory") as build_span:
+                with span("tokenizer.load"):
+                    self.tokenizer=get_tokenizer(tokenizer)
+                self.build_index(filepath)
+            stage="Inverted Index Construction"
         
-        elapsedTime=end_time-start_time
-        usedMemory=self.current_memory-self.initial_memory
-        
-        print(f"Inverted Index Construction\nTime taken: {elapsedTime:.2f} sec | Memory used: {usedMemory:.2f} MB")
+        print(f"{stage}\nTime taken: {build_span.seconds:.4f} sec | {build_span.memory_summary()}")
     
+    def load_disk_index(self, index_dir):
+        self.diskIndex=CompressedIndex(index_dir)
+        self.documentStore=DocumentStore(index_dir)
+
     def tokenize(self,text):
-        doc=self.nlp(text)
-        return [token.lemma_ for token in doc if token.is_alpha and not token.is_stop and not token.is_punct]
+        return self.tokenizer.tokenize(text)
 
     def load_dataset(self, filepath):
+        import ijson
         with open(filepath,"r",encoding="utf-8") as dataset:
             for obj in ijson.items(dataset,'item'):
                 yield{
@@ -48,40 +93,116 @@ class BooleanRetrieval:
             
             for field_text in fields:
                 words=self.tokenize(field_text)
+                count("tokens",len(words))
                 for word in words:
                     self.invertedIndex[word]["docs"].add(obj_id)
                     distinct_terms.add(word)
                 
             for term in distinct_terms:
                 self.invertedIndex[term]["df"]+=1
+            count("docs")
+        count("terms",len(self.invertedIndex))
         
         return {word: {"docs":list(data["docs"]),"df":data["df"]} for word, data in self.invertedIndex.items()}
 
     def writeInvertedIndexToFile(self):
         with open("experiment1/exp1_inverted_index.txt","w+") as file_out:
+            if self.diskIndex is not None:
+                for term in sorted(self.diskIndex.dictionary):
+                    file_out.write(f"{term} -> df: {self.diskIndex.df(term)} | docs: {', '.join(map(str, self.diskIndex.postings(term)))}\n")
+                return
             for term in sorted(self.invertedIndex.keys()):
                 data=self.invertedIndex[term]
                 file_out.write(f"{term} -> df: {data['df']} | docs: {', '.join(map(str, sorted(data['docs'])))}\n")
 
+    def memory_structures(self, report, prefix="exp1"):
+        if self.diskIndex is not None:
+            report.add(f"{prefix} term dictionary (disk index)", self.diskIndex.dictionary)
+            report.add(f"{prefix} document store", self.documentStore)
+            return
+        report.add(f"{prefix} term dictionary", self.invertedIndex, skip=self.invertedIndex.values())
+        report.add(f"{prefix} postings", *self.invertedIndex.values())
+        report.add(f"{prefix} documents", self.documents)
+
+    def vocabulary(self):
+        if self.diskIndex is not None:
+            return self.diskIndex.dictionary.keys()
+        return self.invertedIndex.keys()
+
+    def df(self, term):
+        if self.diskIndex is not None:
+            return self.diskIndex.df(term)
+        return self.invertedIndex.get(term,{}).get("df",0)
+
+    def expand_wildcard(self, pattern):
+        # The k-gram index is built on the first wildcard query only.
+        if self.wildcardIndex is None:
+            with span("exp1.wildcard_index"):
+                self.wildcardIndex=KGramIndex(self.vocabulary())
+        with span("exp1.wildcard_expand"):
+            # One extra term tells whether the expansion was truncated.
+            matches=self.wildcardIndex.expand(pattern,self.max_wildcard_expansions+1,self.df)
+            if len(matches)>self.max_wildcard_expansions:
+                count("wildcard_truncated")
+                matches=matches[:self.max_wildcard_expansions]
+            count("wildcard_expansions",len(matches))
+        return matches
+
+    def correct_term(self, term):
+        if self.spellingCorrector is None:
+            with span("exp1.correction_index"):
+                self.spellingCorrector=SpellingCorrector(self.vocabulary())
+        with span("exp1.correct"):
+            correction=self.spellingCorrector.correct(term,self.df)
+        if correction:
+            self.corrections[term]=correction
+            count("corrections")
+        return correction
+
+    def postings(self, term):
+        if "*" in term:
+            return set().union(*[self.postings(match) for match in self.expand_wildcard(term)])
+        if self.diskIndex is not None:
+            return set(self.diskIndex.postings(term))
+        return self.invertedIndex.get(term,{}).get("docs",set())
+
+    def all_documents(self):
+        # Only NOT needs the universe; compute it once, on first use.
+        if self.universe is None:
+            if self.documentStore is not None:
+                self.universe=set(self.documentStore.doc_ids)
+            else:
+                self.universe=set().union(*[data["docs"] for data in self.invertedIndex.values()])
+        return self.universe
+
     def retrieve(self, query):
         if(len(query)==1):
-            return self.invertedIndex.get(query,{}).get("docs",set())
-        
-        start_time=time.time()
-        initial_memory = psutil.Process().memory_info().rss / (1024 * 1024)
+            return self.postings(query)
         
+        with span("exp1.retrieve") as query_span:
+            result=self.evaluate(query)
+            count("results",len(result))
+
+        print(f"Query Retrieval\nTime Taken: {query_span.seconds:.6f} sec | {query_span.memory_summary()}")
+        if self.corrections:
+            print(f"Did you mean: {self.corrected_query(query)}")
+        return result
+
+    def corrected_query(self, query):
+        return " ".join(self.corrections.get(term,term) for term in query.split())
+
+    def evaluate(self, query):
+        self.corrections={}
         terms=query.split()
         term_stack=[]
         operator_stack=[]
         
-        universe=set().union(*[data["docs"] for data in self.invertedIndex.values()])
-        
         def apply_bool():
             bool_op=operator_stack.pop()
             
             if bool_op=="NOT":
                 term=term_stack.pop()
-                term_stack.append(universe-term)
+                term_stack.append(self.all_documents()-term)
             else:
                 right_term=term_stack.pop()
                 left_term=term_stack.pop()
@@ -101,25 +222,21 @@ class BooleanRetrieval:
                     apply_bool()
                 operator_stack.pop()
             else:
-                term_set=self.invertedIndex.get(term,{}).get("docs",set())
-                term_stack.append(term_set)
+                if self.spell_correct and "*" not in term and not self.df(term):
+                    term=self.correct_term(term) or term
+                term_stack.append(self.postings(term))
+                count("terms")
             
         while operator_stack:
             apply_bool()
             
-        end_time=time.time()
-        current_memory = psutil.Process().memory_info().rss / (1024*1024)
-
-        timeElapsed=end_time-start_time
-        usedMemory=current_memory-initial_memory
-
-        print(f"Query Retrieval\nTime Taken: {timeElapsed:.2f} sec | Memory used: {usedMemory:.2f} MB")
-
-            
         return term_stack.pop() if term_stack else set()
     
     def display_results(self, doc_ids):
         for doc_id in sorted(doc_ids):
+            if self.documentStore is not None:
+                print(f"- Index {doc_id} | Title: {self.documentStore.title(doc_id)}")
+                continue
             doc =self.documents.get(doc_id, {})
             print(f"- Index {doc_id} | Title: {doc.get('Title','N/A')}")
             # print(f"Title: {doc.get('Title', 'N/A')}\n"
@@ -129,10 +246,30 @@ class BooleanRetrieval:
             # )
 
 if __name__=="__main__":
-    filename="Assignment-data/bool_docs.json"
-    bronze_retrieve=BooleanRetrieval(filename)
-    bronze_retrieve.writeInvertedIndexToFile()
-    query=input("Enter a term to search: ")
+    parser=argparse.ArgumentParser(description="Boolean retrieval over an in-memory or experiment3 disk index.")
+    parser.add_argument("--docs",default="Assignment-data/bool_docs.json")
+    parser.add_argument("--index",default=None,help="directory of a compressed index built by experiment3 with --retrieval-index")
+    parser.add_argument("--memory-budget",type=float,default=None,help="postings memory ceiling in MB; beyond it the build spills sorted runs to --spill-dir")
+    parser.add_argument("--spill-dir",default=None,help="keep the spilled runs and index here (default: a temporary directory)")
+    parser.add_argument("--query",default=None,help="run this query instead of prompting for one; terms may use * wildcards, e.g. aero*")
+    parser.add_argument("--no-spell-correct",action="store_true",help="do not replace query terms missing from the index")
+    parser.add_argument("--max-expansions",type=int,default=50,help="dictionary terms a wildcard term may expand to")
+    parser.add_argument("--tokenizer",choices=sorted(TOKENIZERS),default="spacy",help="lookup is a fast spaCy-compatible lemmatizer, see compare_tokenizers.py")
+    add_trace_arguments(parser)
+    args=parser.parse_args()
+    trace_path=configure_from_args(args,"experiment1")
+    
+    if args.index:
+        bronze_retrieve=BooleanRetrieval(index_dir=args.index,max_wildcard_expansions=args.max_expansions,spell_correct=not args.no_spell_correct)
+    else:
+        try:
+            get_tokenizer(args.tokenizer)
+        except FileNotFoundError as error:
+            parser.error(str(error))
+        memory_budget=int(args.memory_budget*1024*1024) if args.memory_budget else None
+        bronze_retrieve=BooleanRetrieval(args.docs,tokenizer=args.tokenizer,memory_budget=memory_budget,spill_dir=args.spill_dir,max_wildcard_expansions=args.max_expansions,spell_correct=not args.no_spell_correct)
+        bronze_retrieve.writeInvertedIndexToFile()
+    query=args.query if args.query is not None else input("Enter a term to search: ")
     
     # for term in query.split():
     #     matchingDocs=bronze_retrieve.retrieve(term)
@@ -143,4 +280,6 @@ if __name__=="__main__":
         # print(f"These are the relevant docs: {sorted(relevant_docs)}")
         bronze_retrieve.display_results(relevant_docs)
     else:
-        print(f"Sorry no documents found for {query}")
\ No newline at end of file
+        print(f"Sorry no documents found for {query}")    
+    if trace_path:
+        write_trace(trace_path)
@@ -0,0 +1,111 @@
+"""Tokenizers shared by in-memory retrieval (experiment1) and the disk indexes
+built in experiment3, so both produce the same terms for the same text."""
+from collections import Counter, defaultdict
+import json
+import os
+import re
+
+# Stopwords and lemmas exported from spaCy for the lookup tokenizer.
+DEFAULT_LOOKUP_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lemma_table.json")
+
+_tokenizers = {}
+
+
+class WhitespaceTokenizer:
+    name = "split"
+
+    def tokenize(self, text):
+        return text.split()
+
+
+class SpacyTokenizer:
+    name = "spacy"
+
+    def __init__(self, model="en_core_web_sm"):
+        # spaCy and its model dominate startup; load them on first use so
+        # code paths that never tokenize (e.g. querying a disk index) skip it.
+        self.model = model
+        self._nlp = None
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            try:
+                import spacy
+            except ImportError as error:
+                raise ImportError(f"The spacy tokenizer needs spaCy and its {self.model} model: "
+                                  f"pip install spacy && python -m spacy download {self.model}") from error
+            self._nlp = spacy.load(self.model)
+        return self._nlp
+
+    def tokenize(self, text):
+        doc = self.nlp(text)
+        return [token.lemma_ for token in doc if token.is_alpha and not token.is_stop and not token.is_punct]
+
+
+class LookupTokenizer:
+    """spaCy-compatible terms without the statistical pipeline.
+
+    A regex keeps alphabetic runs (spaCy's is_alpha tokens), stopwords are
+    dropped by lowercase lookup as spaCy's is_stop does, and each form is
+    mapped to the lemma spaCy most often gave it on the indexed corpus.
+    Lemmas that depend on context can differ, so the index is close to, not
+    identical with, the spaCy one; compare_tokenizers.py measures how close.
+    """
+    name = "lookup"
+    pattern = re.compile(r"[^\W\d_]+")
+
+    def __init__(self, table_path=DEFAULT_LOOKUP_TABLE):
+        if not os.path.exists(table_path):
+            # The table is exported from spaCy's output on the corpus in use,
+            # so it is generated locally rather than shipped.
+            raise FileNotFoundError(
+                f"The lookup tokenizer needs {table_path}, which has not been generated yet. "
+                f"Export it once from spaCy (pip install spacy && python -m spacy download en_core_web_sm) with "
+                f"'python experiment1/compare_tokenizers.py --export --docs <corpus>', "
+                f"which also reports how closely the lookup index agrees with spaCy's; or use --tokenizer spacy or split.")
+        with open(table_path, "r", encoding="utf-8") as file:
+            table = json.load(file)
+        self.stopwords = frozenset(table["stopwords"])
+        self.lemmas = table["lemmas"]
+
+    def tokenize(self, text):
+        lemmas = self.lemmas
+        stopwords = self.stopwords
+        return [lemmas.get(form, form) for form in self.pattern.findall(text) if form.lower() not in stopwords]
+
+
+def export_lookup_table(corpus_paths, table_path=DEFAULT_LOOKUP_TABLE, fields=None):
+    """Run spaCy over the corpora and save its stopwords and form -> lemma choices."""
+    from experiment3.corpus import RETRIEVAL_FIELDS, iterDocuments
+
+    nlp = get_tokenizer("spacy").nlp
+    lemma_counts = defaultdict(Counter)
+    for corpus_path in corpus_paths:
+        for _, _, texts in iterDocuments(corpus_path, fields or RETRIEVAL_FIELDS):
+            for doc in nlp.pipe(texts):
+                for token in doc:
+                    if token.is_alpha and not token.is_stop:
+                        lemma_counts[token.text][token.lemma_] += 1
+
+    # Forms that lemmatize to themselves need no entry.
+    lemmas = {}
+    for form, counts in lemma_counts.items():
+        lemma = counts.most_common(1)[0][0]
+        if lemma != form:
+            lemmas[form] = lemma
+    with open(table_path, "w", encoding="utf-8") as file:
+        json.dump({"stopwords": sorted(nlp.Defaults.stop_words), "lemmas": lemmas}, file)
+    return len(lemmas)
+
+
+TOKENIZERS = {tokenizer.name: tokenizer for tokenizer in [WhitespaceTokenizer, SpacyTokenizer, LookupTokenizer]}
+
+
+def get_tokenizer(name):
+    # Cached per process, so worker processes load a model at most once.
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer '{name}', expected one of: {', '.join(TOKENIZERS)}")
+    if name not in _tokenizers:
+        _tokenizers[name] = TOKENIZERS[name]()
+    return _tokenizers[name]
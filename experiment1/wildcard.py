@@ -0,0 +1,86 @@
+"""k-gram index over the term dictionary for wildcard query terms.
+
+Every term is padded with "$" at both ends and indexed under each of its
+k-grams.  A pattern such as "aero*" or "*elastic" is resolved by
+intersecting the postings of the k-grams its literal parts must contain,
+then post-filtering the candidates against the full pattern: "$re" and
+"red" alone would also let "red*" match "retired".  A plain prefix pattern
+needs neither: its terms are a contiguous range of the sorted dictionary.
+"""
+from bisect import bisect_left
+from collections import Counter
+import heapq
+import re
+
+
+class KGramIndex:
+    def __init__(self, terms, k=3):
+        self.k = k
+        self.terms = sorted(terms)
+        postings = {}
+        for term_id, term in enumerate(self.terms):
+            for gram in self.grams(term):
+                postings.setdefault(gram, []).append(term_id)
+        self.postings = postings
+
+    def __len__(self):
+        return len(self.terms)
+
+    def grams(self, term):
+        padded = f"${term}$"
+        return {padded[i:i + self.k] for i in range(len(padded) - self.k + 1)}
+
+    def overlap_counts(self, term):
+        """Counter of term id -> k-grams shared with term."""
+        counts = Counter()
+        for gram in self.grams(term):
+            counts.update(self.postings.get(gram, ()))
+        return counts
+
+    def pattern_grams(self, pattern):
+        padded = f"${pattern}$"
+        grams = set()
+        for part in padded.split("*"):
+            grams.update(part[i:i + self.k] for i in range(len(part) - self.k + 1))
+        return grams
+
+    def prefix_range(self, prefix):
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + "\U0010ffff", start)
+        return range(start, end)
+
+    def candidates(self, pattern):
+        grams = self.pattern_grams(pattern)
+        if grams:
+            lists = sorted((self.postings.get(gram, []) for gram in grams), key=len)
+            ids = set(lists[0])
+            for other in lists[1:]:
+                if not ids:
+                    break
+                ids.intersection_update(other)
+            return sorted(ids)
+        # Literal parts shorter than k: fall back to the sorted dictionary
+        # for a prefix, or a full scan when the pattern starts with "*".
+        prefix = pattern.split("*", 1)[0]
+        if prefix:
+            return self.prefix_range(prefix)
+        return range(len(self.terms))
+
+    def matches(self, pattern):
+        """Dictionary terms matching pattern, lazily and in sorted order."""
+        terms = self.terms
+        prefix, star, rest = pattern.partition("*")
+        if star and not rest:
+            return (terms[term_id] for term_id in self.prefix_range(prefix))
+        matcher = re.compile(".*".join(re.escape(part) for part in pattern.split("*")) + r"\Z").match
+        return (terms[term_id] for term_id in self.candidates(pattern) if matcher(terms[term_id]))
+
+    def expand(self, pattern, limit=None, key=None):
+        """Dictionary terms matching pattern, in sorted order.
+
+        With limit, only the limit terms with the largest key(term) are kept,
+        largest first and ties in sorted order, without sorting every match.
+        """
+        if limit is None:
+            return list(self.matches(pattern))
+        return heapq.nsmallest(limit, self.matches(pattern), key=lambda term: (-key(term), term))
@@ -0,0 +1,211 @@
+import argparse
+import os
+import sys
+import time
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.history import DEFAULT_HISTORY, append_entry, environment, latency_summary, new_run_id
+from common.instrumentation import MAX_RECORDS, add_trace_arguments, configure_from_args, count, get_tracer, span, start_run, write_trace
+from experiment2.spellcheck import EvaluationSink, available_engines, create_engine, iter_test_queries, load_shared_index
+from experiment2.spellcheck.reporting import format_bytes, get_system_info, print_benchmark_results, write_results_file
+
+RESULT_FILES = {
+    "ngram": "experiment2/nGramResults.txt",
+    "edit_distance": "experiment2/editDistanceResults.txt",
+    "hybrid": "experiment2/hybridResults.txt",
+}
+ENGINE_TITLES = {
+    "ngram": "N-GRAM SPELL CHECKER",
+    "edit_distance": "EDIT DISTANCE SPELL CHECKER",
+    "edit_distance_bitparallel": "BIT-PARALLEL EDIT DISTANCE SPELL CHECKER",
+    "hybrid": "HYBRID SPELL CHECKER",
+    "soundex": "SOUNDEX SPELL CHECKER",
+    "soundex_edit": "SOUNDEX + EDIT DISTANCE SPELL CHECKER",
+}
+SAMPLE_QUERIES = ["akoustic", "abzorption", "bureacratic", "aproximatley"]
+
+
+def memory_tracing_span(name, **attrs):
+    # Benchmarks always report tracemalloc peaks, so make sure the tracer
+    # records them even when no --trace-memory was asked for.
+    if not get_tracer().memory:
+        start_run("experiment2.benchmark", memory=True)
+    return span(name, **attrs)
+
+
+def summarize(sink, total_time, benchmark_span):
+    aggregates = sink.aggregates
+    total_queries = aggregates.count
+    correct_count = int(aggregates.sum("correct"))
+    return {
+        "total_queries": total_queries,
+        "total_time": total_time,
+        "average_time": total_time / total_queries if total_queries else 0,
+        "correct_count": correct_count,
+        "accuracy": correct_count / total_queries if total_queries else 0,
+        "current_memory": format_bytes(benchmark_span.current_bytes),
+        "peak_memory": format_bytes(benchmark_span.peak_bytes),
+        "peak_memory_bytes": benchmark_span.peak_bytes,
+        # Read back from the sink only if a report asks for them.
+        "individual_results": sink.records()
+    }
+
+
+def benchmark_spell_checker(spell_checker, queries, sink=None):
+    sink = sink if sink is not None else EvaluationSink()
+    with memory_tracing_span("benchmark", engine=spell_checker.name) as benchmark_span:
+        for query_item in queries:
+            query = query_item["query"]
+            expected = query_item["corrected"]
+
+            with span("query") as query_span:
+                corrected = spell_checker.spell_check_phrase(query)
+                count("correct", corrected == expected)
+
+            sink.write({
+                "query": query,
+                "corrected": corrected,
+                "expected": expected,
+                "correct": corrected == expected,
+                "time": query_span.seconds
+            })
+
+    return summarize(sink, sink.aggregates.sum("time"), benchmark_span)
+
+
+def benchmark_batch(spell_checker, queries, sink=None, chunk_size=10000):
+    sink = sink if sink is not None else EvaluationSink()
+    queries = iter(queries)
+    with memory_tracing_span("benchmark_batch", engine=spell_checker.name) as benchmark_span:
+        while chunk := list(islice(queries, chunk_size)):
+            with span("batch") as batch_span:
+                corrected_queries = spell_checker.correct_batch([query_item["query"] for query_item in chunk])
+                count("queries", len(chunk))
+            for query_item, corrected in zip(chunk, corrected_queries):
+                sink.write({
+                    "query": query_item["query"],
+                    "corrected": corrected,
+                    "expected": query_item["corrected"],
+                    "correct": corrected == query_item["corrected"],
+                    "time": batch_span.seconds / len(chunk)
+                })
+
+    return summarize(sink, benchmark_span.seconds, benchmark_span)
+
+
+def trial_record(results, sink):
+    """One trial's metrics for the benchmark history."""
+    import numpy as np
+    times = np.sort(np.fromiter((record["time"] for record in sink.records()), dtype=float))
+    return {
+        "queries": results["total_queries"],
+        "total_time": results["total_time"],
+        "average_time": results["average_time"],
+        "accuracy": results["accuracy"],
+        "peak_memory_bytes": results["peak_memory_bytes"],
+        **latency_summary(times),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark one or more experiment2 spell-correction engines.")
+    parser.add_argument("--engines", nargs="+", choices=available_engines(), default=available_engines())
+    parser.add_argument("--dictionary", default="dictionary.txt")
+    parser.add_argument("--documents", default="Assignment-data/bool_docs.json")
+    parser.add_argument("--queries", default="Assignment-data/spell_queries.json")
+    parser.add_argument("--batch", action="store_true", help="correct queries with one correct_batch call per --batch-size")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--records-dir", help="keep each engine's per-query records as <engine>.jsonl here")
+    parser.add_argument("--details", action="store_true", help="print every query result")
+    parser.add_argument("--samples", action="store_true", help="print corrections for a few sample words")
+    parser.add_argument("--no-write", action="store_true", help="do not overwrite the *Results.txt files")
+    parser.add_argument("--repeat", type=int, default=1, help="trials per engine; compare needs at least 2 for a significance test")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="benchmark history file to append this run to")
+    parser.add_argument("--no-history", action="store_true", help="do not record this run in the history")
+    parser.add_argument("--label", help="name for this run in the history, usable as a compare baseline")
+    add_trace_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    trace_path = configure_from_args(args, "experiment2.benchmark")
+    if not get_tracer().memory:
+        # Keep records only for a trace that will be written (--trace, or an
+        # IR_TRACE tracer, which already keeps them); otherwise per-query
+        # span records would only grow.
+        start_run("experiment2.benchmark", memory=True, max_records=MAX_RECORDS if trace_path else get_tracer().max_records)
+
+    system_info = get_system_info()
+    print("System Information:", system_info)
+
+    print("\nLoading shared dictionary and corpus index...")
+    with span("shared_index") as load_span:
+        index = load_shared_index(args.dictionary, args.documents or None)
+    print(f"Shared index load time: {load_span.seconds:.4f} seconds "
+          f"(Loaded {len(index.dictionary_words)} words, {index.document_count} documents)")
+
+    if args.records_dir:
+        os.makedirs(args.records_dir, exist_ok=True)
+
+    all_results = {}
+    history_entries = []
+    for name in args.engines:
+        print(f"\nInitializing {name} engine...")
+        with span("engine_load", engine=name) as load_span:
+            spell_checker = create_engine(name, index)
+        print(f"Engine load time: {load_span.seconds:.4f} seconds")
+
+        print(f"\nRunning {'batch ' if args.batch else ''}benchmark over {args.queries}...")
+        records_path = os.path.join(args.records_dir, f"{name}.jsonl") if args.records_dir else None
+        trials = []
+        for trial in range(args.repeat):
+            queries = iter_test_queries(args.queries)
+            with EvaluationSink(records_path) as sink:
+                if args.batch:
+                    benchmark_results = benchmark_batch(spell_checker, queries, sink, args.batch_size)
+                else:
+                    benchmark_results = benchmark_spell_checker(spell_checker, queries, sink)
+                trials.append(trial_record(benchmark_results, sink))
+                if trial == 0:
+                    print_benchmark_results(benchmark_results, system_info, ENGINE_TITLES.get(name, name.upper()), args.details)
+            benchmark_results.pop("individual_results")
+        if args.repeat > 1:
+            for trial, record in enumerate(trials, 1):
+                print(f"  Trial {trial}/{args.repeat}: total {record['total_time']:.4f} s | p50 {record['p50_ms']:.3f} ms | "
+                      f"p99 {record['p99_ms']:.3f} ms | peak {format_bytes(record['peak_memory_bytes'])}")
+        history_entries.append({"engine": name, "mode": "batch" if args.batch else "per-query", "trials": trials})
+
+        if args.samples:
+            print("\nSample Corrections:")
+            for query in SAMPLE_QUERIES:
+                print(f"  '{query}' -> '{spell_checker.spell_check_phrase(query)}'")
+
+        if not args.no_write and name in RESULT_FILES:
+            write_results_file(benchmark_results, RESULT_FILES[name])
+        all_results[name] = benchmark_results
+
+    if len(all_results) > 1:
+        print("\n========== ENGINE COMPARISON ==========")
+        for name, results in all_results.items():
+            print(f"  - {name:<26} accuracy {results['accuracy'] * 100:6.2f}% | "
+                  f"avg {results['average_time']:.4f} s/query | peak {results['peak_memory']}")
+
+    if not args.no_history and history_entries:
+        run_id, timestamp, env = new_run_id(), time.strftime("%Y-%m-%dT%H:%M:%S"), environment()
+        for entry in history_entries:
+            append_entry(args.history, {"run_id": run_id, "timestamp": timestamp, "label": args.label,
+                                        "benchmark": "experiment2.benchmark", "queries": args.queries,
+                                        "env": env, **entry})
+        print(f"\nRecorded run {run_id} in {args.history} "
+              f"(compare with: python common/history.py --history {args.history} compare --baseline <run>)")
+
+    if trace_path:
+        write_trace(trace_path)
+    return all_results
+
+
+if __name__ == "__main__":
+    main()
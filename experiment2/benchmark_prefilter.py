@@ -0,0 +1,64 @@
+"""Full Jaccard scan vs bit-signature prefiltering for the ngram and hybrid engines.
+
+Every query word is corrected through the per-word path (the one the
+benchmark's per-query mode uses) with signature_bits=0, i.e. every
+dictionary word scored exactly, and with each requested signature width.
+Corrections must agree with the full scan.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.instrumentation import add_trace_arguments, configure_from_args, get_tracer, span, write_trace
+from experiment2.spellcheck import create_engine, load_shared_index, load_test_queries
+
+ENGINES = ["ngram", "hybrid"]
+
+
+def run(engine, words):
+    tracer = get_tracer()
+    scored_before = tracer.totals.get("jaccard_scored", 0)
+    with span("prefilter.correct", engine=engine.name) as correct_span:
+        corrections = [engine.correct_word(word) for word in words]
+    return corrections, correct_span.seconds, tracer.totals.get("jaccard_scored", 0) - scored_before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument("--bits", nargs="+", type=int, default=[64, 128, 256], help="signature widths (multiples of 64)")
+    parser.add_argument("--dictionary", default="dictionary.txt")
+    parser.add_argument("--documents", default="Assignment-data/bool_docs.json")
+    parser.add_argument("--queries", default="Assignment-data/spell_queries.json")
+    add_trace_arguments(parser)
+    args = parser.parse_args(argv)
+    trace_path = configure_from_args(args, "experiment2.benchmark_prefilter")
+
+    from tabulate import tabulate
+
+    index = load_shared_index(args.dictionary, args.documents or None)
+    queries = load_test_queries(args.queries)
+    words = [word for query in queries for word in query["query"].split()]
+
+    table = []
+    for name in args.engines:
+        baseline, baseline_time, baseline_scored = run(create_engine(name, index, signature_bits=0), words)
+        table.append([name, "full scan", f"{baseline_time:.4f}", f"{baseline_time / len(words) * 1000:.3f}", baseline_scored, "1.00x", "-"])
+        for bits in args.bits:
+            engine = create_engine(name, index, signature_bits=bits)
+            corrections, elapsed, scored = run(engine, words)
+            agree = sum(a == b for a, b in zip(corrections, baseline))
+            table.append([name, f"{bits}-bit signatures", f"{elapsed:.4f}", f"{elapsed / len(words) * 1000:.3f}", scored,
+                          f"{baseline_time / elapsed:.2f}x" if elapsed else "-", f"{agree}/{len(words)}"])
+
+    print(f"{len(words)} query words from {len(queries)} queries\n")
+    print(tabulate(table, headers=["Engine", "Scan", "Time (s)", "ms/word", "Exact scores", "Speedup", "Agree"]))
+
+    if trace_path:
+        write_trace(trace_path)
+
+
+if __name__ == "__main__":
+    main()
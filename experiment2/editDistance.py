@@ -1,122 +1,41 @@
-import json
-from itertools import product
+import os
+import sys
 
-def levenshtein_distance(str1, str2):
-    M, N = len(str1), len(str2)
-    D = [[0] * (N + 1) for _ in range(M + 1)]
-    
-    for i in range(M + 1):
-        D[i][0] = i
-    for j in range(N + 1):
-        D[0][j] = j
-    
-    for i in range(1, M + 1):
-        for j in range(1, N + 1):
-            if str1[i-1] == str2[j-1]:
-                substitution_cost = 0
-            else:
-                substitution_cost = 2
-                
-            D[i][j] = min(
-                D[i-1][j] + 1,          
-                D[i][j-1] + 1,          
-                D[i-1][j-1] + substitution_cost  
-            )
-    
-    return D[M][N]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def load_documents(file_path):
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        print(f"Error: Could not find file {file_path}")
-        return []
-    except json.JSONDecodeError:
-        print("Error: Could not decode JSON file.")
-        return []
-    
-def load_dictionary(file_path):
-    dictionary = set()
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line in file:
-                words = line.strip().lower().split()
-                dictionary.update(words)
-    except FileNotFoundError:
-        print(f"Error: Could not find file {file_path}")
-    return dictionary
+from experiment2.spellcheck import EditDistanceSpellChecker, load_shared_index
+from experiment2.spellcheck.edit_distance import generate_correction_combinations
 
-def get_all_corrections(word, dictionary, k=2):
-    word = word.lower()
-    if word in dictionary:
-        return [(word, 0)]
-    
-    candidates = []
-    for dict_word in dictionary:
-        distance = levenshtein_distance(word, dict_word)
-        if distance <= k:
-            candidates.append((dict_word, distance))
-    candidates.sort(key=lambda x: (x[1], x[0]))
-    return candidates if candidates else [(word, 0)]
 
-def spell_check_phrase_all_possibilities(phrase, dictionary, k=2):
-    words = phrase.strip().split()
-    all_corrections = []
-    
-    for word in words:
-        corrections = get_all_corrections(word, dictionary, k)
-        all_corrections.append(corrections)
-    
-    return all_corrections
-
-def generate_correction_combinations(all_corrections, max_combinations=10):
-    combinations = list(product(*[[corr[0] for corr in word_corrs] for word_corrs in all_corrections]))
-    distances = []
-    
-    for combo in combinations:
-        total_distance = sum(min(corr[1] for corr in word_corrs if corr[0] == word) 
-                           for word, word_corrs in zip(combo, all_corrections))
-        distances.append((combo, total_distance))
-    
-    # Sort by total distance and limit results
-    distances.sort(key=lambda x: x[1])
-    return distances[:max_combinations]
-
-def search_corrected_phrases(corrected_phrases, documents):
+def search_corrected_phrases(corrected_phrases, index):
     matching_docs = []
     for phrase, distance in corrected_phrases:
         phrase_str = ' '.join(phrase)
-        for doc in documents:
-            found = False
-            for key in ["Title", "Author", "Bibliographic Source", "Abstract"]:
-                if phrase_str.lower() in doc[key].lower():
-                    matching_docs.append((doc, phrase_str, distance))
-                    found = True
-                    break
-            if found:
-                break
+        doc_ids = index.find_documents(phrase_str)
+        if doc_ids:
+            matching_docs.append((doc_ids[0], phrase_str, distance))
     return matching_docs
 
+
 if __name__ == "__main__":
-    dictionary = load_dictionary("dictionary.txt")
-    documents = load_documents("Assignment-data/bool_docs.json")
-    
+    index = load_shared_index("dictionary.txt", "Assignment-data/bool_docs.json")
+    spell_checker = EditDistanceSpellChecker(k=2).load(index)
+
     test_phrase = "hihg spead aerodynmaics"
 
-    all_corrections = spell_check_phrase_all_possibilities(test_phrase, dictionary)
-    
+    all_corrections = spell_checker.spell_check_phrase_all_possibilities(test_phrase)
+
     print("\nTop phrase combinations:")
     combinations = generate_correction_combinations(all_corrections)
     for phrase, total_distance in combinations:
         print(f"- {' '.join(phrase)} (total distance: {total_distance})")
 
-    matching_docs = search_corrected_phrases(combinations, documents)
-    
+    matching_docs = search_corrected_phrases(combinations, index)
+
     if matching_docs:
         print("\nMatching documents:")
-        for doc, phrase, distance in matching_docs:
-            print(f"- Index {doc['Index']}: {doc['Title']}")
+        for doc_id, phrase, distance in matching_docs:
+            print(f"- Index {doc_id}: {index.titles.get(doc_id, 'N/A')}")
             print(f"  Matched with correction: {phrase} (distance: {distance})")
     else:
         print("\nNo matching documents found.")
@@ -0,0 +1,116 @@
+"""Localhost load generator for experiment2/service.py.
+
+--concurrency clients each hold one keep-alive connection and send
+POST /correct requests back to back, drawing queries round-robin from the
+test set, until --requests have been sent in total.  Reports throughput
+and the latency distribution, plus the server's batching statistics.
+
+    python experiment2/service.py --engine ngram &
+    python experiment2/loadgen.py --concurrency 32 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.stats import percentile
+from experiment2.spellcheck import load_test_queries
+
+
+async def request(reader, writer, host, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, queries, counter, total, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            query = queries[counter[0] % len(queries)]
+            counter[0] += 1
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, host, "POST", "/correct", {"query": query})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def fetch(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return (await request(reader, writer, host, "GET", path))[1]
+    finally:
+        writer.close()
+
+
+async def run(args):
+    queries = [item["query"] for item in load_test_queries(args.queries)]
+    if not queries:
+        raise SystemExit(f"No queries loaded from {args.queries}")
+    before = await fetch(args.host, args.port, "/stats")
+
+    counter, latencies, errors = [0], [], []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(args.host, args.port, queries, counter, args.requests, latencies, errors)
+                           for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+
+    after = await fetch(args.host, args.port, "/stats")
+    batches = after["batches"] - before["batches"]
+    batched = after["queries"] - before["queries"]
+    latencies.sort()
+    return {
+        "engine": after["engine"],
+        "requests": len(latencies),
+        "errors": len(errors),
+        "concurrency": args.concurrency,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0,
+        "batches": batches,
+        "mean_batch_size": batched / batches if batches else 0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure throughput and latency of a running correction service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--queries", default="Assignment-data/spell_queries.json")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    print(f"Engine: {results['engine']} | {results['requests']} requests, {results['errors']} errors, "
+          f"concurrency {results['concurrency']}")
+    print(f"Throughput: {results['throughput']:.1f} requests/s over {results['seconds']:.2f} seconds")
+    print(f"Latency: p50 {results['p50_ms']:.2f} ms | p90 {results['p90_ms']:.2f} ms | "
+          f"p99 {results['p99_ms']:.2f} ms | max {results['max_ms']:.2f} ms")
+    print(f"Server batches: {results['batches']} (mean size {results['mean_batch_size']:.1f})")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""Long-lived local spell-correction service.
+
+The chosen engine is loaded once.  Requests are HTTP/1.1 with JSON bodies
+over keep-alive connections:
+
+    POST /correct   {"query": "hihg spead"}        -> {"corrected": "high speed"}
+                    {"queries": ["...", "..."]}    -> {"corrected": ["...", "..."]}
+    GET  /stats     requests served, batches and mean batch size
+    GET  /health
+
+Queries that arrive within --batch-window-ms of each other (up to
+--max-batch) are corrected together with one correct_batch call, so
+concurrent clients share the engine's per-batch work.  Batches run on a
+pool of --workers threads or processes while the event loop keeps
+accepting and batching requests.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from experiment2.spellcheck import available_engines, create_engine, load_shared_index
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+MAX_BODY_BYTES = 1 << 20
+
+_worker_engine = None
+
+
+def _init_worker(engine_name, dictionary, documents):
+    global _worker_engine
+    _worker_engine = create_engine(engine_name, load_shared_index(dictionary, documents))
+
+
+def _correct_in_worker(queries):
+    return _worker_engine.correct_batch(queries)
+
+
+class MicroBatcher:
+    """Collects queries for up to window seconds and corrects them as one batch."""
+
+    def __init__(self, correct_batch, executor, window=0.005, max_batch=64, workers=1):
+        self.correct_batch = correct_batch
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue()
+        # One batch in flight per worker; the next one keeps filling meanwhile.
+        self.slots = asyncio.Semaphore(workers)
+        self.batches = 0
+        self.queries = 0
+        self.task = None
+        self.in_flight = set()
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def correct(self, queries):
+        loop = asyncio.get_running_loop()
+        futures = []
+        for query in queries:
+            future = loop.create_future()
+            self.queue.put_nowait((query, future))
+            futures.append(future)
+        return await asyncio.gather(*futures)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self.slots.acquire()
+            # The loop only keeps weak references to tasks.
+            task = asyncio.create_task(self.dispatch(batch))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+
+    async def dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            corrected = await loop.run_in_executor(self.executor, self.correct_batch, [query for query, _ in batch])
+            for (_, future), result in zip(batch, corrected):
+                if not future.done():
+                    future.set_result(result)
+            self.batches += 1
+            self.queries += len(batch)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            self.slots.release()
+
+    def stats(self):
+        return {"batches": self.batches, "queries": self.queries,
+                "mean_batch_size": self.queries / self.batches if self.batches else 0}
+
+
+class CorrectionService:
+    def __init__(self, engine_name, batcher):
+        self.engine_name = engine_name
+        self.batcher = batcher
+        self.requests = 0
+        self.started = time.time()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self.route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as error:
+            write_response(writer, 400, {"error": str(error)}, keep_alive=False)
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok", "engine": self.engine_name}
+        if path == "/stats":
+            return 200, dict(self.batcher.stats(), requests=self.requests, engine=self.engine_name,
+                             uptime=time.time() - self.started)
+        if path != "/correct":
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST /correct"}
+        try:
+            data = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return 400, {"error": "Body must be JSON"}
+        if not isinstance(data, dict):
+            data = {}
+        if isinstance(data.get("query"), str):
+            queries, single = [data["query"]], True
+        elif isinstance(data.get("queries"), list) and all(isinstance(query, str) for query in data["queries"]):
+            queries, single = data["queries"], False
+        else:
+            return 400, {"error": "Expected {\"query\": str} or {\"queries\": [str, ...]}"}
+
+        self.requests += 1
+        try:
+            corrected = await self.batcher.correct(queries)
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+        return 200, {"corrected": corrected[0] if single else corrected}
+
+
+async def read_request(reader):
+    """(method, path, headers, body) of the next request, or None at end of stream."""
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError("Malformed request line")
+    method, path, _ = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        raise ValueError("Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def write_response(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+
+
+def make_executor(args):
+    if args.pool == "process":
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                                       initargs=(args.engine, args.dictionary, args.documents or None))
+        return executor, _correct_in_worker
+    from concurrent.futures import ThreadPoolExecutor
+    engine = create_engine(args.engine, load_shared_index(args.dictionary, args.documents or None))
+    return ThreadPoolExecutor(args.workers), engine.correct_batch
+
+
+async def serve(args):
+    start = time.perf_counter()
+    executor, correct_batch = make_executor(args)
+    if args.pool == "process":
+        # Start the workers, each loading the engine in its initializer,
+        # before accepting requests.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(executor, _correct_in_worker, [])
+                               for _ in range(args.workers)])
+    print(f"Loaded {args.engine} in {time.perf_counter() - start:.2f} seconds")
+
+    batcher = MicroBatcher(correct_batch, executor, args.batch_window_ms / 1000, args.max_batch, args.workers)
+    batcher.start()
+    service = CorrectionService(args.engine, batcher)
+    server = await asyncio.start_server(service.handle_connection, args.host, args.port)
+    print(f"Serving {args.engine} on http://{args.host}:{args.port} "
+          f"(window {args.batch_window_ms} ms, max batch {args.max_batch}, {args.workers} {args.pool} workers)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve an experiment2 spell-correction engine over HTTP/JSON.")
+    parser.add_argument("--engine", choices=available_engines(), default="edit_distance_bitparallel")
+    parser.add_argument("--dictionary", default="dictionary.txt")
+    parser.add_argument("--documents", default="Assignment-data/bool_docs.json")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-window-ms", type=float, default=5.0, help="how long to collect queries into one batch")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--pool", choices=["thread", "process"], default="thread")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,46 @@
-import json
+import math
 import os
-import pandas as pd
-from itertools import product
-import psutil
-from tabulate import tabulate 
+import sys
+from itertools import islice, product
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from experiment2.spellcheck import EvaluationSink, create_engine, generate_soundex_code, iter_test_queries, load_shared_index
+
+SHOWN_SUGGESTIONS=50
 
 class Soundex:
-    def __init__(self,filepath):
-        self.dictionary=self.load_dictionary()
-        self.documents=self.load_dataset(filepath)
+    def __init__(self,filepath,sink=None):
+        self.index=load_shared_index("dictionary.txt",filepath)
+        self.engine=create_engine("soundex",self.index)
         self.columns=["Query", "TP", "FP", "Precision", "Accuracy"]
-        self.df=pd.DataFrame(columns=self.columns)
+        # Per-query rows stream to the sink; aggregates are kept as they arrive.
+        self.sink=sink if sink is not None else EvaluationSink()
         self.correctResults=0
-    
-    def load_dictionary(self):
-        with open("dictionary.txt","r") as file:
-            dictionary=[line.strip() for line in file]
-            return dictionary
-    
-    def load_dataset(self, filepath):
-        with open(filepath,"r") as dataset:
-            return json.load(dataset)
-
-    def soundex_tokenize(self,query):
-        query=query.upper().split()        
-        return [self.generate_soundex_code(term) for term in query]
-        
+
     def generate_soundex_code(self, term):
-        term=term.upper()
-        soundex=term[0]
-        
-        soundex_dictionary={"BFPV":"1","CGJKQSXZ":"2","DT":"3","L":"4","MN":"5","R":"6","AEIOUHWY":"0"}
-        
-        for t in term[1:]:
-            for key in soundex_dictionary.keys():
-                if t in key:
-                    code=soundex_dictionary[key]
-                    if code!="0" and code!=soundex[-1]:
-                        soundex+=(code)
-                    
-        return soundex[:4].ljust(4,"0")
-        
+        return generate_soundex_code(term)
+
     def suggest_words(self,query):
-        code_list=self.soundex_tokenize(query)
-        suggestions=[]
-        for term in code_list:
-            suggestions_per_word=[]
-            suggestions_per_word={word for word in self.dictionary if self.generate_soundex_code(word.upper())==term}
-            suggestions.append(suggestions_per_word)
-            
-        permutations=list(product(*suggestions))
-            
-        return permutations
-            
+        return self.engine.suggest_words(query)
+
+    def iterSuggestions(self,query):
+        return (" ".join(words) for words in product(*[self.engine.suggest_word(term) for term in query.split()]))
+
+    def countMatches(self,query,corrected):
+        # Suggestions are every combination of per-term candidates, so they
+        # can be counted without being enumerated: the corrected phrase is
+        # among them at most once.
+        candidates=[self.engine.suggest_word(term) for term in query.split()]
+        total=math.prod(len(words) for words in candidates)
+        parts=corrected.split(" ")
+        TP=int(len(parts)==len(candidates) and all(part in words for part,words in zip(parts,candidates)))
+        return TP, total-TP
+
     def searchDocs(self,permutation):
-        matchingDocs={}
-        
-        for doc in self.documents:
-            for key in ["Title", "Author", "Bibliographic Source", "Abstract"]:
-                if permutation.lower() in doc[key].lower():
-                    matchingDocs[doc["Index"]]=doc
-                            
-        return list(matchingDocs.values()) if matchingDocs else None
-        
+        matchingDocs=[{"Index":doc_id,"Title":self.index.titles.get(doc_id,"")} for doc_id in self.index.find_documents(permutation)]
+        return matchingDocs if matchingDocs else None
+
     def writeResults(self,query, corrected, suggestions):
         TP, FP= 0, 0
         for suggestion in suggestions:
@@ -70,42 +48,65 @@ class Soundex:
                 TP += 1
             else:
                 FP += 1
-                
+        self.record(query,TP,FP,suggestions[:SHOWN_SUGGESTIONS])
+
+    def evaluate(self,query,corrected):
+        TP, FP=self.countMatches(query,corrected)
+        self.record(query,TP,FP,islice(self.iterSuggestions(query),SHOWN_SUGGESTIONS))
+
+    def record(self,query,TP,FP,suggestions=()):
         precision = TP / (TP + FP) if (TP+FP) > 0 else 0
-        accuracy = TP/len(suggestions) if len(suggestions) else 0
-            
-        i=len(self.df)
-        self.df.loc[i]=[query,TP, FP, precision, accuracy]
+        accuracy = TP/(TP+FP) if (TP+FP) > 0 else 0
+        self.sink.write({"Query":query,"TP":TP,"FP":FP,"Precision":precision,"Accuracy":accuracy,"Suggestions":list(suggestions)})
         if TP > 0:
             self.correctResults += 1
-        
+
+    def summary(self):
+        aggregates=self.sink.aggregates
+        queries=aggregates.count
+        suggested=aggregates.sum("TP")+aggregates.sum("FP")
+        return (f"Precision = {(aggregates.sum('TP')/queries if queries else 0):.3f} | "
+                f"Accuracy acc to the formula= {(aggregates.sum('TP')/suggested if suggested else 0):.6f} | "
+                f"Correct Results = {self.correctResults}/{queries} | "
+                f"Accuracy (based on Correct Results)={(self.correctResults/queries if queries else 0):.6f}")
+
+    def cells(self,index,row):
+        return [str(index)]+[format(row[column],"g") if isinstance(row[column],float) else str(row[column]) for column in self.columns]
+
+    def writeReport(self,path):
+        headers=[""]+self.columns
+        # Numeric fields are the ones the sink aggregates; they align right.
+        numeric=[True]+[column in self.sink.aggregates.sums for column in self.columns]
+        # One pass sizes the columns and a second writes the single table, so
+        # it is never held in memory as a whole.
+        widths=[len(header) for header in headers]
+        for i,row in enumerate(self.sink.records()):
+            widths=[max(width,len(cell)) for width,cell in zip(widths,self.cells(i,row))]
+        def line(cells):
+            return "  ".join(cell.rjust(width) if right else cell.ljust(width) for cell,width,right in zip(cells,widths,numeric))
+        with open(path,"w") as file:
+            for row in self.sink.records():
+                file.write(f"for {row['Query']}, did you mean: {row['Suggestions']}\n")
+            file.write(f"\n{line(headers)}\n{'  '.join('-'*width for width in widths)}\n")
+            for i,row in enumerate(self.sink.records()):
+                file.write(line(self.cells(i,row))+"\n")
+            file.write(f"\n{self.summary()}")
+
 if __name__=="__main__":
-    soundex=Soundex("Assignment-data/bool_docs.json")
-    # for evaulation
-    with open("Assignment-data/spell_queries.json") as queryFile:
-        testSet=json.load(queryFile)
-    with open("experiment2/soundexResults.txt","w") as file:
-        for line in testSet:
-            query=line['query']
-        #singular runtime search
+    with EvaluationSink("experiment2/soundexResults.jsonl") as sink:
+        soundex=Soundex("Assignment-data/bool_docs.json",sink)
+        # for evaulation
+        for line in iter_test_queries("Assignment-data/spell_queries.json"):
+            #singular runtime search
             # query=input("Enter search query:")
-            suggestions=soundex.suggest_words(query)
-            cleaned_suggestions=[" ".join(suggested_word) for suggested_word in suggestions]
-            soundex.writeResults(query, line['corrected'],sorted(cleaned_suggestions))
-            with open("experiment2/soundexResults.txt","a") as file:
-                file.write(f"for {query}, did you mean: {cleaned_suggestions[:50]}\n")
-        
-        print(f"Precision = {(soundex.df["TP"].sum()/len(soundex.df)):.3f} | Accuracy acc to the formula= {(soundex.df["TP"].sum()/soundex.df[["TP","FP"]].sum(axis=1).sum()):.6f} | Correct Results = {soundex.correctResults}/{len(soundex.df)} | Accuracy (based on Correct Results)={soundex.correctResults/len(soundex.df)}")
-        with open("experiment2/soundexResults.txt","a") as file:
-            file.write("\n")
-            file.write(tabulate(soundex.df,headers="keys",))
-            file.write("\n")
-            file.write(f"\nPrecision = {(soundex.df["TP"].sum()/len(soundex.df)):.3f} | Accuracy acc to the formula= {(soundex.df["TP"].sum()/soundex.df[["TP","FP"]].sum(axis=1).sum()):.6f} | Correct Results = {soundex.correctResults}/{len(soundex.df)} | Accuracy (based on Correct Results)={soundex.correctResults/len(soundex.df):3f}")
+            soundex.evaluate(line['query'],line['corrected'])
+        print(soundex.summary())
+        soundex.writeReport("experiment2/soundexResults.txt")
         # To display results during runtime
-            # for suggestion in sorted(cleaned_suggestions):
+            # for suggestion in sorted(soundex.iterSuggestions(query)):
             #     matchingDocs=soundex.searchDocs(suggestion)
             #     if matchingDocs:
             #         print(f"Did you mean: {suggestion}")
             #         print("Matching documents")
             #         for doc in matchingDocs:
-            #             print(f"- Index {doc['Index']}: {doc['Title']}")
\ No newline at end of file
+            #             print(f"- Index {doc['Index']}: {doc['Title']}")
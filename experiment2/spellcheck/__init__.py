@@ -0,0 +1,10 @@
+from .base import SpellEngine
+from .dawg import DAWG
+from .edit_distance import BitParallelEditDistanceSpellChecker, EditDistanceSpellChecker, levenshtein_distance
+from .evaluation import Aggregates, EvaluationSink
+from .hybrid import HybridSpellChecker
+from .index import Lexicon, SharedIndex, load_shared_index
+from .loaders import iter_documents, iter_test_queries, load_dictionary, load_documents, load_test_queries
+from .ngram import NgramSpellChecker, jaccard_similarity
+from .registry import ENGINES, available_engines, create_engine, register_engine
+from .soundex import SoundexEditSpellChecker, SoundexSpellChecker, generate_soundex_code
@@ -0,0 +1,41 @@
+class SpellEngine:
+    """Common protocol for the experiment2 correctors.
+
+    ``load`` attaches the engine to a SharedIndex, ``correct_word`` returns the
+    single best correction for one word and ``correct_batch`` corrects a list
+    of query phrases, which is much faster than one ``correct_phrase`` call per
+    query when the engine overrides ``correct_words``.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.index = None
+
+    def load(self, index):
+        self.index = index
+        return self
+
+    def correct_word(self, word):
+        raise NotImplementedError
+
+    def split_phrase(self, phrase):
+        return phrase.strip().split()
+
+    def correct_phrase(self, phrase):
+        return " ".join(self.correct_word(word) for word in self.split_phrase(phrase))
+
+    def correct_words(self, words):
+        return {word: self.correct_word(word) for word in words}
+
+    def correct_batch(self, queries):
+        # Deduplicate words across the whole batch so each distinct word is
+        # corrected once; engines override correct_words to share work
+        # between the remaining words.
+        split_queries = [self.split_phrase(query) for query in queries]
+        unique_words = list(dict.fromkeys(word for words in split_queries for word in words))
+        corrections = self.correct_words(unique_words)
+        return [" ".join(corrections[word] for word in words) for words in split_queries]
+
+    def spell_check_phrase(self, phrase):
+        return self.correct_phrase(phrase)
@@ -0,0 +1,169 @@
+"""Bit-parallel edit distances from one word to a whole dictionary.
+
+The query's character positions are bits of a 64-bit word, so one pass
+over a candidate's characters updates a full column of the edit-distance
+matrix with a handful of integer operations.  Candidates are grouped by
+length and stored as character-code matrices, letting NumPy advance the
+bit-vectors of every candidate of that length in lockstep, one column per
+step.
+
+Two metrics are supported:
+
+- unit-cost Levenshtein, using Myers' algorithm in Hyyrö's formulation;
+- the project's metric, where substitution costs 2.  A substitution then
+  never beats a deletion plus an insertion, so the distance equals the
+  indel distance m + n - 2 * LCS.  The LCS comes from the bit-parallel
+  algorithm of Allison-Dix and Hyyrö.
+
+Queries longer than 64 characters fall back to the same recurrences on
+Python integers, which have no width limit.
+"""
+import numpy as np
+
+WORD_BITS = 64
+
+
+def pattern_masks(word):
+    """Bit mask of the positions of each character of word."""
+    masks = {}
+    for position, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    return masks
+
+
+def myers_distance(word, candidate):
+    """Unit-cost Levenshtein distance, on Python integers of any width."""
+    m = len(word)
+    if m == 0:
+        return len(candidate)
+    masks = pattern_masks(word)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for char in candidate:
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def lcs_length(word, candidate):
+    """Length of the longest common subsequence, on Python integers."""
+    masks = pattern_masks(word)
+    mask = (1 << len(word)) - 1
+    v = mask
+    for char in candidate:
+        u = v & masks.get(char, 0)
+        v = ((v + u) | (v - u)) & mask
+    return len(word) - bin(v).count("1")
+
+
+def indel_distance(word, candidate):
+    """Edit distance with substitutions costing 2 (insert + delete)."""
+    return len(word) + len(candidate) - 2 * lcs_length(word, candidate)
+
+
+class PackedLexicon:
+    """Dictionary words grouped by length as character-code matrices."""
+
+    def __init__(self, words):
+        words = sorted(set(words))
+        alphabet = sorted(set("".join(words)))
+        # Code 0 is reserved for characters the dictionary never uses.
+        self.codes = {char: code for code, char in enumerate(alphabet, 1)}
+        self.alphabet_size = len(alphabet) + 1
+        grouped = {}
+        for word in words:
+            grouped.setdefault(len(word), []).append(word)
+        self.groups = {}
+        for length, group in grouped.items():
+            matrix = np.array([[self.codes[char] for char in word] for word in group], dtype=np.uint8 if self.alphabet_size <= 256 else np.uint32)
+            self.groups[length] = (group, matrix.reshape(len(group), length))
+
+    def __len__(self):
+        return sum(len(group) for group, _ in self.groups.values())
+
+    def _mask_table(self, word):
+        table = np.zeros(self.alphabet_size, dtype=np.uint64)
+        for char, mask in pattern_masks(word).items():
+            code = self.codes.get(char)
+            if code is not None:
+                table[code] = mask
+        return table
+
+    def distances(self, word, substitution_cost=1, lengths=None):
+        """Yield (words, distances) for each length group, optionally only the given lengths.
+
+        substitution_cost is 1 (Levenshtein) or 2 (indel distance).
+        """
+        if substitution_cost not in (1, 2):
+            raise ValueError(f"Unsupported substitution cost {substitution_cost}, expected 1 or 2")
+        selected = self.groups if lengths is None else [length for length in lengths if length in self.groups]
+        if len(word) > WORD_BITS:
+            scalar = myers_distance if substitution_cost == 1 else indel_distance
+            for length in selected:
+                group = self.groups[length][0]
+                yield group, np.array([scalar(word, candidate) for candidate in group])
+            return
+
+        table = self._mask_table(word)
+        kernel = _levenshtein_columns if substitution_cost == 1 else _indel_columns
+        for length in selected:
+            group, matrix = self.groups[length]
+            yield group, kernel(table, matrix, len(word))
+
+    def within(self, word, k, substitution_cost=1):
+        """(word, distance) pairs within distance k, sorted by (distance, word)."""
+        lengths = range(max(0, len(word) - k), len(word) + k + 1)
+        matches = []
+        for group, distances in self.distances(word, substitution_cost, lengths):
+            for i in np.flatnonzero(distances <= k):
+                matches.append((group[i], int(distances[i])))
+        matches.sort(key=lambda x: (x[1], x[0]))
+        return matches
+
+
+def _levenshtein_columns(table, matrix, m):
+    count, n = matrix.shape
+    if m == 0:
+        return np.full(count, n, dtype=np.int64)
+    # Bits above m - 1 hold garbage, but carries and shifts only move
+    # upwards, so they never reach the bits that are read.
+    high = np.uint64(1 << (m - 1))
+    pv = np.full(count, (1 << m) - 1, dtype=np.uint64)
+    mv = np.zeros(count, dtype=np.uint64)
+    score = np.full(count, m, dtype=np.int64)
+    for column in range(n):
+        eq = table[matrix[:, column]]
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        score += (ph & high) != 0
+        score -= (mh & high) != 0
+        ph = (ph << np.uint64(1)) | np.uint64(1)
+        mh = mh << np.uint64(1)
+        pv = mh | ~(xv | ph)
+        mv = ph & xv
+    return score
+
+
+def _indel_columns(table, matrix, m):
+    count, n = matrix.shape
+    mask = np.uint64((1 << m) - 1)
+    v = np.full(count, mask, dtype=np.uint64)
+    for column in range(n):
+        u = v & table[matrix[:, column]]
+        v = ((v + u) | (v - u)) & mask
+    lcs = m - np.bitwise_count(v).astype(np.int64)
+    return m + n - 2 * lcs
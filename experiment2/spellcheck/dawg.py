@@ -0,0 +1,118 @@
+"""Minimized DAWG of the dictionary with bounded edit-distance search.
+
+Words are inserted in sorted order and equivalent suffix states are merged
+as soon as they can no longer change (Daciuk et al.'s incremental
+construction), so "...ation", "...ing" and "...s" endings are stored once.
+The automaton is kept in flat arrays: the outgoing edges of state s are
+labels[offsets[s]:offsets[s + 1]], leading to targets[...] in the same
+range, sorted by label.
+
+search() walks the automaton carrying one row of the edit-distance matrix
+per edge, so a prefix shared by thousands of words ("aero", "accel") is
+compared once, and drops every branch whose row minimum already exceeds k.
+"""
+from array import array
+
+ROOT = 0
+
+
+class DAWG:
+    def __init__(self, words):
+        edges = [{}]
+        final = [False]
+        register = {}
+        unchecked = []
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, label, child = unchecked.pop()
+                key = (final[child], tuple(edges[child].items()))
+                if key in register:
+                    edges[parent][label] = register[key]
+                    edges[child] = None
+                else:
+                    register[key] = child
+
+        previous = ""
+        for word in sorted(set(words)):
+            common = 0
+            while common < min(len(word), len(previous)) and word[common] == previous[common]:
+                common += 1
+            minimize(common)
+            state = unchecked[-1][2] if unchecked else ROOT
+            for label in word[common:]:
+                edges.append({})
+                final.append(False)
+                child = len(edges) - 1
+                edges[state][label] = child
+                unchecked.append((state, label, child))
+                state = child
+            final[state] = True
+            previous = word
+        minimize(0)
+        self._compact(edges, final)
+
+    def _compact(self, edges, final):
+        # Renumber the surviving states densely, in breadth-first order.
+        number = {ROOT: 0}
+        order = [ROOT]
+        for state in order:
+            for child in edges[state].values():
+                if child not in number:
+                    number[child] = len(order)
+                    order.append(child)
+
+        self.offsets = array("I", [0])
+        self.targets = array("I")
+        self.final = bytearray(final[state] for state in order)
+        labels = []
+        for state in order:
+            for label, child in sorted(edges[state].items()):
+                labels.append(label)
+                self.targets.append(number[child])
+            self.offsets.append(len(labels))
+        self.labels = "".join(labels)
+
+    @property
+    def state_count(self):
+        return len(self.final)
+
+    @property
+    def edge_count(self):
+        return len(self.labels)
+
+    def __iter__(self):
+        """All words, in sorted order."""
+        stack = [(ROOT, "")]
+        while stack:
+            state, prefix = stack.pop()
+            if self.final[state]:
+                yield prefix
+            for edge in reversed(range(self.offsets[state], self.offsets[state + 1])):
+                stack.append((self.targets[edge], prefix + self.labels[edge]))
+
+    def search(self, word, k, substitution_cost=1):
+        """Words within distance k of word, as (word, distance) in sorted word order.
+
+        Insertions and deletions cost 1 and substitutions substitution_cost.
+        Returns the matches and the number of matrix rows computed.
+        """
+        offsets, labels, targets, final = self.offsets, self.labels, self.targets, self.final
+        columns = range(1, len(word) + 1)
+        matches = []
+        rows = 0
+        stack = [(ROOT, "", list(range(len(word) + 1)))]
+        while stack:
+            state, prefix, row = stack.pop()
+            if final[state] and row[-1] <= k:
+                matches.append((prefix, row[-1]))
+            for edge in reversed(range(offsets[state], offsets[state + 1])):
+                label = labels[edge]
+                current = [row[0] + 1]
+                for j in columns:
+                    diagonal = row[j - 1] if word[j - 1] == label else row[j - 1] + substitution_cost
+                    current.append(min(row[j] + 1, current[j - 1] + 1, diagonal))
+                rows += 1
+                if min(current) <= k:
+                    stack.append((targets[edge], prefix + label, current))
+        return matches, rows
@@ -0,0 +1,111 @@
+from itertools import product
+
+from common.instrumentation import count
+
+from .base import SpellEngine
+from .registry import register_engine
+
+
+SUBSTITUTION_COST = 2
+
+
+def levenshtein_distance(str1, str2):
+    M, N = len(str1), len(str2)
+    D = [[0] * (N + 1) for _ in range(M + 1)]
+
+    for i in range(M + 1):
+        D[i][0] = i
+    for j in range(N + 1):
+        D[0][j] = j
+
+    for i in range(1, M + 1):
+        for j in range(1, N + 1):
+            if str1[i-1] == str2[j-1]:
+                substitution_cost = 0
+            else:
+                substitution_cost = SUBSTITUTION_COST
+
+            D[i][j] = min(
+                D[i-1][j] + 1,
+                D[i][j-1] + 1,
+                D[i-1][j-1] + substitution_cost
+            )
+
+    return D[M][N]
+
+
+def generate_correction_combinations(all_corrections, max_combinations=10):
+    combinations = list(product(*[[corr[0] for corr in word_corrs] for word_corrs in all_corrections]))
+    distances = []
+
+    for combo in combinations:
+        total_distance = sum(min(corr[1] for corr in word_corrs if corr[0] == word)
+                             for word, word_corrs in zip(combo, all_corrections))
+        distances.append((combo, total_distance))
+
+    # Sort by total distance and limit results
+    distances.sort(key=lambda x: x[1])
+    return distances[:max_combinations]
+
+
+@register_engine("edit_distance")
+class EditDistanceSpellChecker(SpellEngine):
+    def __init__(self, k=2):
+        super().__init__()
+        self.k = k
+        self.lexicon = None
+        self.dawg = None
+
+    def load(self, index):
+        super().load(index)
+        self.lexicon = index.lexicon()
+        self.dawg = self.lexicon.dawg()
+        return self
+
+    def get_all_corrections(self, word):
+        word = word.lower()
+        if word in self.lexicon:
+            return [(word, 0)]
+
+        candidates, rows = self.dawg.search(word, self.k, SUBSTITUTION_COST)
+        count("dp_rows", rows)
+        candidates.sort(key=lambda x: (x[1], x[0]))
+        return candidates if candidates else [(word, 0)]
+
+    def spell_check_phrase_all_possibilities(self, phrase):
+        return [self.get_all_corrections(word) for word in self.split_phrase(phrase)]
+
+    def correct_word(self, word):
+        return self.get_all_corrections(word)[0][0]
+
+    def correct_words(self, words):
+        corrections = {}
+        for word in words:
+            lowered = word.lower()
+            if lowered not in corrections:
+                corrections[lowered] = self.correct_word(lowered)
+        return {word: corrections[word.lower()] for word in words}
+
+
+@register_engine("edit_distance_bitparallel")
+class BitParallelEditDistanceSpellChecker(EditDistanceSpellChecker):
+    """Same corrections, with exact distances to every dictionary word of a
+    compatible length computed by the bit-parallel NumPy kernels."""
+
+    def __init__(self, k=2):
+        super().__init__(k)
+        self.packed = None
+
+    def load(self, index):
+        super().load(index)
+        from .bitparallel import PackedLexicon
+        self.packed = PackedLexicon(self.lexicon.words)
+        return self
+
+    def get_all_corrections(self, word):
+        word = word.lower()
+        if word in self.lexicon:
+            return [(word, 0)]
+
+        candidates = self.packed.within(word, self.k, SUBSTITUTION_COST)
+        return candidates if candidates else [(word, 0)]
@@ -0,0 +1,70 @@
+"""Streaming evaluation records.
+
+Per-query results are appended to a JSONL file as they are produced and
+folded into running aggregates, so evaluating a test set needs memory for
+one record, not for the whole run.  Reports are rendered afterwards by
+re-reading the same file handle.
+"""
+import json
+import tempfile
+
+
+class Aggregates:
+    """Count, sum, min and max of every numeric field (booleans count as 0/1)."""
+
+    def __init__(self):
+        self.count = 0
+        self.sums = {}
+        self.minimum = {}
+        self.maximum = {}
+
+    def update(self, record):
+        self.count += 1
+        for key, value in record.items():
+            if isinstance(value, (int, float)):
+                self.sums[key] = self.sums.get(key, 0) + value
+                self.minimum[key] = min(self.minimum.get(key, value), value)
+                self.maximum[key] = max(self.maximum.get(key, value), value)
+
+    def sum(self, key):
+        return self.sums.get(key, 0)
+
+    def mean(self, key):
+        return self.sum(key) / self.count if self.count else 0
+
+
+class EvaluationSink:
+    """JSONL sink over a single file handle; path=None keeps it in a temporary file."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.file = open(path, "w+", encoding="utf-8") if path else tempfile.TemporaryFile("w+", encoding="utf-8")
+        self.aggregates = Aggregates()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.aggregates.count
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        self.aggregates.update(record)
+
+    def records(self):
+        """Every record written so far, read back lazily from the start of the
+        file.  Nothing may be written until the iteration has finished."""
+        self.file.flush()
+        position = self.file.tell()
+        self.file.seek(0)
+        try:
+            while line := self.file.readline():
+                yield json.loads(line)
+        finally:
+            self.file.seek(position)
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,120 @@
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from common.instrumentation import count
+
+from .base import SpellEngine
+from .index import generate_ngrams
+from .ngram import jaccard_similarity
+from .registry import register_engine
+
+
+def levenshtein_similarity(word1, word2):
+    return SequenceMatcher(None, word1, word2).ratio()
+
+
+@register_engine("hybrid")
+class HybridSpellChecker(SpellEngine):
+    def __init__(self, n=2, threshold=0.5, signature_bits=64):
+        super().__init__()
+        self.n = n
+        self.threshold = threshold
+        self.signature_bits = signature_bits
+        self.lexicon = None
+        self.word_ngrams = {}
+        self.signatures = None
+
+    def load(self, index):
+        super().load(index)
+        self.lexicon = index.lexicon()
+        self.word_ngrams = self.lexicon.ngrams(self.n)
+        self.signatures = self.lexicon.ngram_signatures(self.n, self.signature_bits)
+        return self
+
+    def candidate_words(self, word, word_ngrams):
+        if self.signatures is None:
+            return self.lexicon.words
+        # Upper bound of the combined score: the signature bound on Jaccard
+        # plus SequenceMatcher's ratio bound of 2 * min(len) / total length.
+        bounds = 0.5 * self.signatures.jaccard_bounds(word_ngrams) + 0.5 * self.signatures.ratio_bounds(word)
+        return [self.lexicon.words[i] for i in (bounds >= self.threshold).nonzero()[0]]
+
+    def get_candidates(self, word, debug=False):
+        if debug:
+            print(f"Correcting word: {word}")
+        lowered = word.lower()
+        word_ngrams = generate_ngrams(lowered, self.n)
+        candidates = []
+
+        scan = self.candidate_words(lowered, word_ngrams)
+        count("jaccard_scored", len(scan))
+        for candidate in scan:
+            jaccard = jaccard_similarity(word_ngrams, self.word_ngrams[candidate])
+            levenshtein = levenshtein_similarity(lowered, candidate)
+            combined_score = 0.5 * jaccard + 0.5 * levenshtein
+            if combined_score >= self.threshold:
+                candidates.append((candidate, combined_score))
+
+        candidates.sort(key=lambda x: (-x[1], x[0]))
+
+        if debug:
+            print(f"Candidates for '{word}': {candidates[:5]}")
+        return candidates if candidates else [(word, 0.0)]
+
+    def correct_word(self, word):
+        if word.lower() in self.lexicon:
+            return word
+        return self.get_candidates(word)[0][0]
+
+    def correct_words(self, words):
+        corrections = {}
+        pending = defaultdict(list)
+        for word in words:
+            if word.lower() in self.lexicon:
+                corrections[word] = word
+            else:
+                pending[word.lower()].append(word)
+
+        for lowered in pending:
+            word_ngrams = generate_ngrams(lowered, self.n)
+            # The same candidates as get_candidates.  SequenceMatcher's ratio
+            # is at most 2 * min(len) / total length, so they are visited
+            # best bound first and the expensive ratio stops as soon as no
+            # remaining bound can reach the best.
+            scan = self.candidate_words(lowered, word_ngrams)
+            count("jaccard_scored", len(scan))
+            bounded = []
+            for candidate in scan:
+                jaccard = jaccard_similarity(word_ngrams, self.word_ngrams[candidate])
+                total_length = len(lowered) + len(candidate)
+                bound = 0.5 * jaccard + 0.5 * (2.0 * min(len(lowered), len(candidate)) / total_length)
+                if bound >= self.threshold:
+                    bounded.append((bound, jaccard, candidate))
+            bounded.sort(key=lambda x: (-x[0], x[2]))
+
+            best = None
+            for bound, jaccard, candidate in bounded:
+                if best is not None and bound < best[0]:
+                    break
+                combined_score = 0.5 * jaccard + 0.5 * levenshtein_similarity(lowered, candidate)
+                if combined_score >= self.threshold and (best is None or (-combined_score, candidate) < (-best[0], best[1])):
+                    best = (combined_score, candidate)
+
+            for word in pending[lowered]:
+                corrections[word] = best[1] if best else word
+        return corrections
+
+    def correct_phrase_with_candidates(self, phrase, debug=False):
+        corrected_words = []
+        all_corrections = {}
+
+        for word in self.split_phrase(phrase):
+            if word.lower() not in self.lexicon:
+                corrections = self.get_candidates(word, debug)
+                corrected_words.append(corrections[0][0])
+                all_corrections[word] = corrections
+            else:
+                corrected_words.append(word)
+                all_corrections[word] = [(word, 1.0)]
+
+        return ' '.join(corrected_words), all_corrections
@@ -0,0 +1,213 @@
+import re
+import tempfile
+from array import array
+from collections import Counter, defaultdict
+
+from .dawg import DAWG
+from .loaders import iter_documents, load_dictionary
+
+
+def generate_ngrams(word, n):
+    return frozenset(word[i:i+n] for i in range(len(word) - n + 1))
+
+
+class Lexicon:
+    """A sorted word list plus lazily built, cached views over it.
+
+    Engines that draw on the same words (e.g. edit distance, Soundex and the
+    hybrid scorer all use dictionary.txt) receive the same Lexicon object, so
+    n-gram sets, n-gram postings and grouped views are only built once.
+    """
+
+    def __init__(self, words):
+        self.words = sorted(set(words))
+        self.word_set = set(self.words)
+        self._ngrams = {}
+        self._ngram_postings = {}
+        self._groups = {}
+        self._signatures = {}
+        self._dawg = None
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.word_set
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def ngrams(self, n):
+        if n not in self._ngrams:
+            self._ngrams[n] = {word: generate_ngrams(word, n) for word in self.words}
+        return self._ngrams[n]
+
+    def ngram_postings(self, n):
+        if n not in self._ngram_postings:
+            postings = defaultdict(list)
+            for word, word_ngrams in self.ngrams(n).items():
+                for ngram in word_ngrams:
+                    postings[ngram].append(word)
+            self._ngram_postings[n] = dict(postings)
+        return self._ngram_postings[n]
+
+    def ngram_signatures(self, n, bits=64):
+        """Signatures for prefiltering candidates, or None when bits is 0 or
+        None: engines then score every word exactly (the full scan)."""
+        if not bits:
+            return None
+        if (n, bits) not in self._signatures:
+            from .signature import NgramSignatures
+            self._signatures[n, bits] = NgramSignatures(self.words, self.ngrams(n), bits)
+        return self._signatures[n, bits]
+
+    def count_ngram_overlaps(self, n, ngram_sets):
+        """Return one Counter of shared n-grams per candidate for each set.
+
+        Each n-gram's posting list is fetched once for the whole batch and
+        credited to every set containing that n-gram.
+        """
+        postings = self.ngram_postings(n)
+        sets_by_ngram = defaultdict(list)
+        for i, word_ngrams in enumerate(ngram_sets):
+            for ngram in word_ngrams:
+                sets_by_ngram[ngram].append(i)
+
+        overlaps = [Counter() for _ in ngram_sets]
+        for ngram, set_ids in sets_by_ngram.items():
+            candidates = postings.get(ngram)
+            if candidates:
+                for i in set_ids:
+                    overlaps[i].update(candidates)
+        return overlaps
+
+    def dawg(self):
+        if self._dawg is None:
+            self._dawg = DAWG(self.words)
+        return self._dawg
+
+    def memory_structures(self, report, prefix="lexicon"):
+        report.add(f"{prefix} words", self.words, self.word_set)
+        for n, word_ngrams in self._ngrams.items():
+            report.add(f"{prefix} {n}-gram sets", word_ngrams)
+        for n, postings in self._ngram_postings.items():
+            report.add(f"{prefix} {n}-gram postings", postings)
+        for (n, bits), signatures in self._signatures.items():
+            report.add(f"{prefix} {n}-gram {bits}-bit signatures", signatures, skip=[signatures.words])
+        for name, groups in self._groups.items():
+            report.add(f"{prefix} {name} groups", groups)
+        if self._dawg is not None:
+            report.add(f"{prefix} DAWG", self._dawg)
+
+    def grouped(self, name, key):
+        if name not in self._groups:
+            groups = defaultdict(list)
+            for word in self.words:
+                groups[key(word)].append(word)
+            self._groups[name] = dict(groups)
+        return self._groups[name]
+
+
+class TitleStore:
+    """Document titles in a temporary file, read back one at a time.
+
+    Only each document's position (in load order) and the end offsets of
+    the titles stay in memory.
+    """
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.positions = {}
+        self.offsets = array("Q", [0])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.positions
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def add(self, doc_id, title):
+        data = str(title).encode("utf-8")
+        self.file.seek(self.offsets[-1])
+        self.file.write(data)
+        self.positions[doc_id] = len(self.offsets) - 1
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def get(self, doc_id, default=None):
+        position = self.positions.get(doc_id)
+        if position is None:
+            return default
+        start = self.offsets[position]
+        self.file.seek(start)
+        return self.file.read(self.offsets[position + 1] - start).decode("utf-8")
+
+
+class SharedIndex:
+    """Dictionary and corpus data loaded once and shared by every engine.
+
+    The corpus is streamed: each document's text is only held while its
+    words are added to word_to_docs, so loading needs memory for the index
+    and the largest document, not for the whole file.  Titles go to a
+    TitleStore on disk.
+    """
+
+    def __init__(self, dictionary_path, documents_path=None):
+        self.dictionary_path = dictionary_path
+        self.documents_path = documents_path
+        self.dictionary_words = load_dictionary(dictionary_path)
+        self.document_count = 0
+        self.titles = TitleStore()
+        self.word_to_docs = defaultdict(set)
+        self._lexicons = {}
+        if documents_path:
+            self.load_documents(documents_path)
+
+    def load_documents(self, file_path):
+        for doc in iter_documents(file_path):
+            self.document_count += 1
+            doc_id = doc.get("Index", self.document_count)
+            text = " ".join(str(value) for value in doc.values()).lower()
+            self.titles.add(doc_id, doc.get("Title", ""))
+            for word in set(re.findall(r'\w+', text)):
+                self.word_to_docs[word].add(doc_id)
+        self._lexicons.clear()
+
+    def lexicon(self, include_corpus=False, min_length=1):
+        key = (include_corpus, min_length)
+        if key not in self._lexicons:
+            words = [word for word in self.dictionary_words if len(word) >= min_length]
+            if include_corpus:
+                words.extend(word for word in self.word_to_docs if len(word) >= min_length)
+            self._lexicons[key] = Lexicon(words)
+        return self._lexicons[key]
+
+    def memory_structures(self, report, prefix="exp2"):
+        report.add(f"{prefix} dictionary words", self.dictionary_words)
+        report.add(f"{prefix} document titles", self.titles)
+        report.add(f"{prefix} word -> docs terms", self.word_to_docs, skip=self.word_to_docs.values())
+        report.add(f"{prefix} word -> docs postings", *self.word_to_docs.values())
+        for (include_corpus, min_length), lexicon in self._lexicons.items():
+            source = "dictionary+corpus" if include_corpus else "dictionary"
+            lexicon.memory_structures(report, f"{prefix} lexicon[{source}, len>={min_length}]")
+
+    def find_documents(self, phrase):
+        """Documents containing every word of the phrase, in load order."""
+        words = re.findall(r'\w+', phrase.lower())
+        if not words:
+            return []
+        postings = sorted((self.word_to_docs.get(word, set()) for word in words), key=len)
+        matches = set.intersection(*postings)
+        return [doc_id for doc_id in self.titles if doc_id in matches]
+
+
+_shared_indexes = {}
+
+
+def load_shared_index(dictionary_path, documents_path=None):
+    key = (dictionary_path, documents_path)
+    if key not in _shared_indexes:
+        _shared_indexes[key] = SharedIndex(dictionary_path, documents_path)
+    return _shared_indexes[key]
@@ -0,0 +1,60 @@
+import json
+
+
+def load_dictionary(file_path):
+    words = []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                words.extend(line.strip().lower().split())
+    except FileNotFoundError:
+        print(f"Error: Could not find file {file_path}")
+    return words
+
+
+def load_documents(file_path):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {file_path}")
+        return []
+    except json.JSONDecodeError:
+        print(f"Error: Invalid JSON format in {file_path}")
+        return []
+
+
+def iter_documents(file_path):
+    """Yield corpus documents one at a time without reading the whole file."""
+    import ijson
+    try:
+        with open(file_path, 'rb') as file:
+            yield from ijson.items(file, 'item', use_float=True)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {file_path}")
+    except ijson.JSONError:
+        print(f"Error: Invalid JSON format in {file_path}")
+
+
+def load_test_queries(file_path):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {file_path}")
+        return []
+    except json.JSONDecodeError:
+        print("Error: Could not decode JSON file.")
+        return []
+
+
+def iter_test_queries(file_path):
+    """Yield test queries one at a time without reading the whole file."""
+    import ijson
+    try:
+        with open(file_path, 'rb') as file:
+            yield from ijson.items(file, 'item')
+    except FileNotFoundError:
+        print(f"Error: Could not find file {file_path}")
+    except ijson.JSONError:
+        print("Error: Could not decode JSON file.")
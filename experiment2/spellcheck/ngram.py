@@ -0,0 +1,113 @@
+import re
+from collections import defaultdict
+
+from common.instrumentation import count
+
+from .base import SpellEngine
+from .index import generate_ngrams
+from .registry import register_engine
+
+
+def jaccard_similarity(set1, set2):
+    intersection = len(set1 & set2)
+    union = len(set1 | set2)
+    return intersection / union if union != 0 else 0
+
+
+@register_engine("ngram")
+class NgramSpellChecker(SpellEngine):
+    def __init__(self, n=2, signature_bits=64):
+        super().__init__()
+        self.n = n
+        self.signature_bits = signature_bits
+        self.lexicon = None
+        self.word_ngrams = {}
+        self.signatures = None
+
+    def load(self, index):
+        super().load(index)
+        # Corpus words are part of the candidate set, as in the original checker.
+        self.lexicon = index.lexicon(include_corpus=True, min_length=3)
+        self.word_ngrams = self.lexicon.ngrams(self.n)
+        self.signatures = self.lexicon.ngram_signatures(self.n, self.signature_bits)
+        return self
+
+    def generate_ngrams(self, word):
+        return generate_ngrams(word, self.n)
+
+    def split_phrase(self, phrase):
+        return re.findall(r'\w+', phrase.lower())
+
+    def suggest_correction_word(self, word):
+        word_ngrams = self.generate_ngrams(word)
+        if self.signatures is not None:
+            return self.suggest_with_signatures(word, word_ngrams)
+
+        max_similarity = 0
+        best_matches = []
+
+        for candidate in self.lexicon.words:
+            similarity = jaccard_similarity(word_ngrams, self.word_ngrams[candidate])
+            if similarity > max_similarity:
+                max_similarity = similarity
+                best_matches = [candidate]
+            elif similarity == max_similarity:
+                best_matches.append(candidate)
+        count("jaccard_scored", len(self.lexicon.words))
+
+        return best_matches if best_matches else [word]
+
+    def suggest_with_signatures(self, word, word_ngrams):
+        """suggest_correction_word, scoring candidates best bound first and
+        stopping once no remaining bound can reach the best similarity."""
+        order, bounds = self.signatures.best_first(word_ngrams)
+        max_similarity = 0
+        best_ids = []
+        scored = 0
+        for i in order:
+            if bounds[i] < max_similarity or bounds[i] == 0:
+                break
+            candidate = self.lexicon.words[i]
+            similarity = jaccard_similarity(word_ngrams, self.word_ngrams[candidate])
+            scored += 1
+            if similarity > max_similarity:
+                max_similarity = similarity
+                best_ids = [i]
+            elif similarity == max_similarity:
+                best_ids.append(i)
+        count("jaccard_scored", scored)
+
+        if max_similarity == 0:
+            # Every word ties at 0, as in the full scan.
+            return list(self.lexicon.words) if self.lexicon.words else [word]
+        return [self.lexicon.words[i] for i in sorted(best_ids)]
+
+    def correct_word(self, word):
+        return self.suggest_correction_word(word)[0]
+
+    def correct_words(self, words):
+        # Words with the same n-gram signature always get the same correction.
+        signatures = defaultdict(list)
+        for word in words:
+            signatures[self.generate_ngrams(word)].append(word)
+
+        signature_list = list(signatures)
+        overlaps = self.lexicon.count_ngram_overlaps(self.n, signature_list)
+
+        corrections = {}
+        for word_ngrams, overlap in zip(signature_list, overlaps):
+            max_similarity = 0
+            best_match = self.lexicon.words[0] if self.lexicon.words else None
+            for candidate, shared in overlap.items():
+                union = len(word_ngrams) + len(self.word_ngrams[candidate]) - shared
+                similarity = shared / union
+                if similarity > max_similarity or (similarity == max_similarity and candidate < best_match):
+                    max_similarity = similarity
+                    best_match = candidate
+            for word in signatures[word_ngrams]:
+                corrections[word] = best_match if best_match is not None else word
+        return corrections
+
+    def suggest_correction(self, phrase):
+        corrected_phrase = self.correct_phrase(phrase)
+        return {"corrected_phrase": corrected_phrase, "documents": self.index.find_documents(corrected_phrase)}
@@ -0,0 +1,19 @@
+ENGINES = {}
+
+
+def register_engine(name):
+    def decorator(cls):
+        cls.name = name
+        ENGINES[name] = cls
+        return cls
+    return decorator
+
+
+def available_engines():
+    return sorted(ENGINES)
+
+
+def create_engine(name, index, **options):
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine '{name}', expected one of: {', '.join(available_engines())}")
+    return ENGINES[name](**options).load(index)
@@ -0,0 +1,56 @@
+import platform
+
+
+def format_bytes(bytes):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if bytes < 1024 or unit == 'GB':
+            return f"{bytes:.2f} {unit}"
+        bytes /= 1024
+
+
+def get_system_info():
+    processor = platform.processor()
+    if not processor:
+        processor = platform.machine()
+
+    import psutil
+    memory = psutil.virtual_memory()
+    total_memory = format_bytes(memory.total)
+
+    return {
+        "processor": processor,
+        "total_memory": total_memory,
+        "system": platform.system(),
+        "python_version": platform.python_version()
+    }
+
+
+def print_benchmark_results(results, system_info, algorithm_name, details=False):
+    print(f"\n========== {algorithm_name} BENCHMARK RESULTS ==========")
+    print(f"System Information:")
+    print(f"  - Processor: {system_info['processor']}")
+    print(f"  - Total Memory: {system_info['total_memory']}")
+    print(f"  - Operating System: {system_info['system']}")
+    print(f"  - Python Version: {system_info['python_version']}")
+
+    print("\nBenchmark Summary:")
+    print(f"  - Total Queries: {results['total_queries']}")
+    print(f"  - Total Time: {results['total_time']:.4f} seconds")
+    print(f"  - Average Time per Query: {results['average_time']:.4f} seconds")
+    print(f"  - Correct Results: {results['correct_count']}/{results['total_queries']} ({results['accuracy'] * 100:.2f}%)")
+    print(f"  - Peak Memory Usage: {results['peak_memory']}")
+
+    if not details:
+        return
+    print("\nIndividual Query Results:")
+    for idx, result in enumerate(results['individual_results'], 1):
+        print(f"  {idx}. Query: '{result['query']}'")
+        print(f"     - Corrected: '{result['corrected']}'")
+        print(f"     - Expected: '{result['expected']}'")
+        print(f"     - Correct: {'✓' if result['correct'] else '✗'}")
+        print(f"     - Time: {result['time']:.4f} seconds")
+
+
+def write_results_file(results, file_path):
+    with open(file_path, "w+") as file_out:
+        file_out.write(f"- Total Queries: {results['total_queries']}\n- Total Time: {results['total_time']:.4f} seconds\n- Average Time per Query: {results['average_time']:.4f} seconds\n- Correct Results: {results['correct_count']}/{results['total_queries']} ({results['accuracy'] * 100:.2f}%)")
@@ -0,0 +1,61 @@
+"""Bit signatures of n-gram sets for bounding Jaccard similarity.
+
+Each n-gram sets bit crc32(ngram) % bits of its word's signature.  An
+n-gram of A whose bit is clear in B's signature cannot be in B, and each
+set bit of sigA & ~sigB stands for at least one such n-gram, so
+
+    |A & B| <= min(|A| - popcount(sigA & ~sigB), |B| - popcount(sigB & ~sigA))
+
+and since |A & B| / (|A| + |B| - |A & B|) grows with the intersection,
+the same bound caps the Jaccard similarity.  The bound is computed for
+every dictionary word at once; only words whose bound can still reach
+the best (or the threshold) are scored exactly with set operations.
+"""
+from zlib import crc32
+
+import numpy as np
+
+
+class NgramSignatures:
+    def __init__(self, words, ngram_sets, bits=64):
+        if bits <= 0 or bits % 64:
+            raise ValueError(f"Signature width must be a positive multiple of 64, got {bits}")
+        self.bits = bits
+        self.words = words
+        self.sizes = np.array([len(ngram_sets[word]) for word in self.words], dtype=np.int64)
+        self.lengths = np.array([len(word) for word in self.words], dtype=np.int64)
+        self.signatures = np.zeros((len(self.words), bits // 64), dtype=np.uint64)
+        for row, word in enumerate(self.words):
+            self.signatures[row] = self.signature(ngram_sets[word])
+
+    def __len__(self):
+        return len(self.words)
+
+    def signature(self, ngrams):
+        chunks = [0] * (self.bits // 64)
+        for ngram in ngrams:
+            bit = crc32(ngram.encode("utf-8")) % self.bits
+            chunks[bit // 64] |= 1 << (bit % 64)
+        return np.array(chunks, dtype=np.uint64)
+
+    def intersection_bounds(self, ngrams):
+        signature = self.signature(ngrams)
+        only_query = np.bitwise_count(signature & ~self.signatures).sum(axis=1, dtype=np.int64)
+        only_word = np.bitwise_count(self.signatures & ~signature).sum(axis=1, dtype=np.int64)
+        return np.minimum(len(ngrams) - only_query, self.sizes - only_word)
+
+    def jaccard_bounds(self, ngrams):
+        shared = self.intersection_bounds(ngrams)
+        union = len(ngrams) + self.sizes - shared
+        bounds = np.zeros(len(self.words))
+        np.divide(shared, union, out=bounds, where=union > 0)
+        return bounds
+
+    def ratio_bounds(self, word):
+        """Upper bounds of difflib's ratio, 2 * matches / total length."""
+        return 2.0 * np.minimum(len(word), self.lengths) / (len(word) + self.lengths)
+
+    def best_first(self, ngrams):
+        """Word ids by decreasing Jaccard bound, and the bounds themselves."""
+        bounds = self.jaccard_bounds(ngrams)
+        return np.argsort(-bounds, kind="stable"), bounds
@@ -0,0 +1,79 @@
+from itertools import product
+
+from .base import SpellEngine
+from .edit_distance import levenshtein_distance
+from .registry import register_engine
+
+SOUNDEX_CODES = {"BFPV": "1", "CGJKQSXZ": "2", "DT": "3", "L": "4", "MN": "5", "R": "6", "AEIOUHWY": "0"}
+
+
+def generate_soundex_code(term):
+    term = term.upper()
+    soundex = term[0]
+
+    for t in term[1:]:
+        for key in SOUNDEX_CODES.keys():
+            if t in key:
+                code = SOUNDEX_CODES[key]
+                if code != "0" and code != soundex[-1]:
+                    soundex += code
+
+    return soundex[:4].ljust(4, "0")
+
+
+@register_engine("soundex")
+class SoundexSpellChecker(SpellEngine):
+    def __init__(self):
+        super().__init__()
+        self.lexicon = None
+        self.codes = {}
+
+    def load(self, index):
+        super().load(index)
+        self.lexicon = index.lexicon()
+        self.codes = self.lexicon.grouped("soundex", generate_soundex_code)
+        return self
+
+    def suggest_word(self, word):
+        return self.codes.get(generate_soundex_code(word), [])
+
+    def suggest_words(self, query):
+        return list(product(*[self.suggest_word(term) for term in query.split()]))
+
+    def correct_word(self, word):
+        word = word.lower()
+        if word in self.lexicon:
+            return word
+        suggestions = self.suggest_word(word)
+        if not suggestions:
+            return word
+        # Soundex alone cannot rank words sharing a code, so break ties by edit distance.
+        return min(suggestions, key=lambda suggestion: (levenshtein_distance(word, suggestion), suggestion))
+
+
+@register_engine("soundex_edit")
+class SoundexEditSpellChecker(SoundexSpellChecker):
+    """Soundex candidates filtered and ranked by edit distance."""
+
+    def __init__(self, k=2):
+        super().__init__()
+        self.k = k
+
+    def get_all_corrections(self, word):
+        word = word.lower()
+        if word in self.lexicon:
+            return [(word, 0)]
+
+        candidates = []
+        for suggestion in self.suggest_word(word):
+            distance = levenshtein_distance(word, suggestion)
+            if distance <= self.k:
+                candidates.append((suggestion, distance))
+        candidates.sort(key=lambda x: (x[1], x[0]))
+        return candidates if candidates else [(word, 0)]
+
+    def spell_check_phrase_all_possibilities(self, phrase):
+        return [self.get_all_corrections(word) for word in self.split_phrase(phrase)]
+
+    def correct_word(self, word):
+        return self.get_all_corrections(word)[0][0]
@@ -0,0 +1,73 @@
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.instrumentation import add_trace_arguments, configure_from_args, count, span, write_trace
+from experiment3.postings import CODECS, CompressedIndex, CompressedIndexWriter, intersect_all
+
+def loadTextIndex(filepath):
+    index={}
+    with open(filepath,"r") as file:
+        for line in file:
+            term, postings = line.rstrip("\n").split(":",1)
+            index[term]=[int(docID) for docID in postings.split(",")] if postings else []
+    return index
+
+def sampleQueries(index, count, seed=0):
+    # Mix frequent/frequent pairs (long lists, where skips pay off) with
+    # frequent/rare pairs (where galloping pays off).
+    rng=random.Random(seed)
+    by_df=sorted(index,key=lambda term: len(index[term]),reverse=True)
+    frequent=by_df[:max(2,len(by_df)//100)]
+    rare=by_df[len(by_df)//100:] or by_df
+    queries=[]
+    for i in range(count):
+        if i%2==0:
+            queries.append(rng.sample(frequent,2))
+        else:
+            queries.append([rng.choice(frequent),rng.choice(rare)])
+    return queries
+
+def timeQueries(queries, fetch, method):
+    with span("intersect",method=method) as query_span:
+        results=[intersect_all([fetch(term) for term in query],method) for query in queries]
+        count("queries",len(queries))
+    return query_span.seconds, results
+
+if __name__=="__main__":
+    parser=argparse.ArgumentParser(description="Compare the compressed skip-pointer index against blockMerged.txt.")
+    parser.add_argument("--dir",default="experiment3/writtenBlocks")
+    parser.add_argument("--queries",type=int,default=500)
+    parser.add_argument("--codecs",nargs="+",choices=sorted(CODECS),default=sorted(CODECS))
+    add_trace_arguments(parser)
+    args=parser.parse_args()
+    trace_path=configure_from_args(args,"experiment3.benchmark_index")
+    
+    text_path=os.path.join(args.dir,"blockMerged.txt")
+    text_index=loadTextIndex(text_path)
+    queries=sampleQueries(text_index,args.queries)
+    baseline_time, expected=timeQueries(queries,text_index.__getitem__,"linear")
+    
+    print(f"{'Index':<22} {'Size (KB)':>10} {'Ratio':>6} {'AND method':<10} {'Time (ms)':>10} {'Speedup':>8}")
+    baseline_size=os.path.getsize(text_path)
+    print(f"{'blockMerged.txt':<22} {baseline_size/1024:>10.1f} {1:>6.2f} {'linear':<10} {baseline_time*1000:>10.2f} {1:>8.2f}")
+    for codec in args.codecs:
+        name=f"benchmark_{codec}"
+        with CompressedIndexWriter(args.dir,codec,name) as index_out:
+            for term in sorted(text_index):
+                index_out.write(term,text_index[term])
+        index=CompressedIndex(args.dir,name)
+        for method in ["linear","skip","galloping"]:
+            # "linear" on the compressed index decodes the full lists first.
+            fetch=(lambda term: list(index.postings(term))) if method=="linear" else index.postings
+            elapsed, results=timeQueries(queries,fetch,method)
+            if results!=expected:
+                raise AssertionError(f"{codec}/{method} intersection disagrees with the uncompressed index")
+            print(f"{codec + ' + skips':<22} {index.size_bytes/1024:>10.1f} {index.size_bytes/baseline_size:>6.2f} {method:<10} {elapsed*1000:>10.2f} {baseline_time/elapsed:>8.2f}")
+        index.close()
+    
+    if trace_path:
+        write_trace(trace_path)
@@ -0,0 +1,134 @@
+"""Incremental memory accounting for block construction.
+
+Block memory is estimated from approximate CPython object costs as terms and
+postings are added.  Blocks fill the budget less a fixed reserve for
+everything else the process holds, and the final merge is fitted to the
+same share by shrinking its read buffers or its fan-in.
+
+The estimates cannot see allocator fragmentation, which grows with the
+corpus, so RSS is also sampled as blocks fill.  Once it reaches the budget
+while still growing, the current block is cut and later blocks get half
+the room, down to MIN_BLOCK_SCALE.  Only a build that still goes beyond
+the tolerance with blocks that small fails with MemoryBudgetExceeded.  A
+tolerance of None sizes blocks from the estimates alone and only reports
+the peak.
+"""
+import os
+import sys
+import tracemalloc
+
+# A new dictionary term: its str object, a dict slot and an empty list (or,
+# for BSBI's global term dictionary, a list slot for the reverse mapping).
+TERM_OVERHEAD_BYTES = 100
+# A SPIMI posting: a list slot plus an int object.
+SPIMI_POSTING_BYTES = 40
+# A BSBI posting at its peak, during inversion: 8 bytes in the pair arrays,
+# a packed 64-bit sort key (int object + list slot + sort scratch space) and
+# a slot + int object in the inverted postings list.
+BSBI_POSTING_BYTES = 8 + 56 + 40
+MIN_BLOCK_POSTINGS = 1024
+# RSS a build needs besides its blocks: the corpus parser's buffers and
+# per-document objects, file buffers and allocator fragmentation.
+RESERVED_BYTES = 2 << 20
+# Smallest read buffer a merge is given before it merges fewer runs per pass.
+MIN_MERGE_BUFFER_SIZE = 4096
+# The final merge writes blockMerged.txt and the compressed .idx and .dict.
+MERGE_OUTPUT_FILES = 3
+# Postings added between RSS samples while a block is being filled.
+RSS_SAMPLE_INTERVAL = 1 << 14
+# Smallest share of the block budget that RSS pressure shrinks blocks to.
+MIN_BLOCK_SCALE = 1 / 64
+
+
+def term_bytes(term):
+    return TERM_OVERHEAD_BYTES + sys.getsizeof(term)
+
+
+def block_budget(budget_bytes):
+    """The part of a memory budget that blocks (and later the merge) may fill.
+
+    Budgets too small to cover RESERVED_BYTES keep a quarter for blocks; the
+    tolerance check then decides whether the build fits at all.
+    """
+    return max(budget_bytes - RESERVED_BYTES, budget_bytes // 4)
+
+
+def merge_plan(budget_bytes, run_count, buffer_size, max_open_files=None):
+    """(buffer_size, max_open_files) for a merge that fits budget_bytes.
+
+    Each run reader holds up to two buffers while it refills, and every
+    output file has one.  Buffers shrink first; once they would drop below
+    MIN_MERGE_BUFFER_SIZE, fewer runs are merged per pass instead.
+    """
+    fan_in = max(2, min(run_count, max_open_files or run_count))
+    size = min(buffer_size, budget_bytes // (2 * fan_in + MERGE_OUTPUT_FILES))
+    if size < MIN_MERGE_BUFFER_SIZE:
+        size = MIN_MERGE_BUFFER_SIZE
+        fan_in = max(2, (budget_bytes // size - MERGE_OUTPUT_FILES) // 2)
+    return size, fan_in
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    pass
+
+
+class MemoryBudget:
+    def __init__(self, budget_bytes, tolerance=0.1):
+        self.budget_bytes = budget_bytes
+        self.tolerance = tolerance
+        import psutil
+        self.process = psutil.Process(os.getpid())
+        # Under tracemalloc, RSS mostly measures the tracer itself, so the
+        # traced allocations are sampled instead.
+        self.traced = tracemalloc.is_tracing()
+        self.baseline_rss = self.rss()
+        self.peak_rss = self.baseline_rss
+        self.postings = 0
+        # Share of the block budget blocks may fill; halved under RSS pressure.
+        self.scale = 1.0
+        self.pressure_rss = 0
+
+    def rss(self):
+        return tracemalloc.get_traced_memory()[0] if self.traced else self.process.memory_info().rss
+
+    def sampleRSS(self):
+        """Sample RSS; True when the block being filled should be cut now."""
+        rss = self.rss()
+        self.peak_rss = max(self.peak_rss, rss)
+        current = rss - self.baseline_rss
+        # RSS rarely shrinks, so only growth at the budget is pressure.
+        if self.tolerance is None or current < self.budget_bytes or current <= self.pressure_rss:
+            return False
+        self.pressure_rss = current
+        if not self.within_tolerance and self.scale <= MIN_BLOCK_SCALE:
+            raise MemoryBudgetExceeded(self.summary())
+        self.scale = max(MIN_BLOCK_SCALE, self.scale / 2)
+        return True
+
+    def addPostings(self, n=1):
+        """Count postings added to the block being filled; True when it
+        should be cut now."""
+        self.postings += n
+        if self.postings < RSS_SAMPLE_INTERVAL:
+            return False
+        self.postings = 0
+        return self.sampleRSS()
+
+    def blockBytes(self, block_bytes):
+        return int(block_bytes * self.scale)
+
+    @property
+    def peak_over_baseline(self):
+        return self.peak_rss - self.baseline_rss
+
+    @property
+    def within_tolerance(self):
+        return self.peak_over_baseline <= self.budget_bytes * (1 + (self.tolerance or 0))
+
+    def summary(self):
+        if self.tolerance is None:
+            verdict = "within budget" if self.within_tolerance else "over budget"
+        else:
+            verdict = f"{'within' if self.within_tolerance else 'OVER'} {self.tolerance*100:.0f}% tolerance"
+        return (f"Budget: {self.budget_bytes/(1024*1024):.2f} MB | Peak {'traced' if self.traced else 'RSS'} over baseline: "
+                f"{self.peak_over_baseline/(1024*1024):.2f} MB ({verdict})")
@@ -0,0 +1,20 @@
+# Fields indexed by the original experiment3 builders, and the fields
+# BooleanRetrieval (experiment1) indexes.
+DEFAULT_FIELDS = ["Title", "Abstract"]
+RETRIEVAL_FIELDS = ["Title", "Author", "Bibliographic Source", "Abstract"]
+
+
+def loadReaders(tokenizer):
+    """Load the corpus parser and the tokenizer's model ahead of a build, so
+    an RSS baseline taken afterwards leaves only block data to account for."""
+    import ijson
+    tokenizer.tokenize("")
+
+
+def iterDocuments(filepath, fields=DEFAULT_FIELDS):
+    """Stream (docID, title, field texts) from a JSON array corpus."""
+    import ijson
+
+    with open(filepath, "r", encoding="utf-8") as file:
+        for obj in ijson.items(file, "item"):
+            yield int(obj.get("Index")), obj.get("Title", ""), [obj.get(field, "") for field in fields]
@@ -0,0 +1,50 @@
+"""Document id / title sidecar written next to the merged index.
+
+Readers keep only the docIDs and file offsets in memory and read a title
+when a result is displayed.
+"""
+from array import array
+import os
+
+from .runs import DEFAULT_BUFFER_SIZE
+
+
+class DocumentStoreWriter:
+    def __init__(self, dirpath, name="blockMerged", buffer_size=DEFAULT_BUFFER_SIZE):
+        self.file = open(os.path.join(dirpath, f"{name}.docs"), "w", encoding="utf-8", buffering=buffer_size)
+
+    def add(self, docID, title):
+        self.file.write(f"{docID}\t{' '.join(title.split())}\n")
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DocumentStore:
+    def __init__(self, dirpath, name="blockMerged"):
+        self.path = os.path.join(dirpath, f"{name}.docs")
+        self.doc_ids = array("Q")
+        self.offsets = {}
+        with open(self.path, "rb") as file:
+            offset = 0
+            for line in file:
+                docID = int(line.split(b"\t", 1)[0])
+                self.doc_ids.append(docID)
+                self.offsets[docID] = offset
+                offset += len(line)
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def title(self, docID):
+        if docID not in self.offsets:
+            return "N/A"
+        with open(self.path, "rb") as file:
+            file.seek(self.offsets[docID])
+            return file.readline().decode("utf-8").rstrip("\n").split("\t", 1)[1]
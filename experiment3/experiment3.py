@@ -1,136 +1,273 @@
-from collections import defaultdict
-import ijson
+from array import array
+from collections import defaultdict, namedtuple
+import argparse
 import os
-import psutil
-import time
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.instrumentation import add_trace_arguments, configure_from_args, count, get_tracer, span, start_run, write_trace
+from experiment1.tokenizers import TOKENIZERS, get_tokenizer
+from experiment3.budget import BSBI_POSTING_BYTES, MIN_BLOCK_POSTINGS, MemoryBudget, MemoryBudgetExceeded, block_budget, merge_plan
+from experiment3.corpus import DEFAULT_FIELDS, RETRIEVAL_FIELDS, iterDocuments, loadReaders
+from experiment3.docstore import DocumentStoreWriter
+from experiment3.merge import merge_index
+from experiment3.pipeline import PipelinedBSBI
+from experiment3.postings import CODECS
+from experiment3.runs import DEFAULT_BUFFER_SIZE, TERM_KEYS, RunWriter, remove_runs
+from experiment3.spimi import SPIMI
+from experiment3.termdict import TermDictionary
+
+# A parsed block: read-only views over the block's (termID, docID) pairs.
+Block = namedtuple("Block", ["termIDs", "docIDs"])
+
+# termIDs and docIDs are each stored as one unsigned 32-bit array entry.
+POSTING_BYTES = 2 * array("I").itemsize
+
+def block_bytes_to_postings(block_bytes):
+    return max(1,block_bytes//POSTING_BYTES)
 
 class BSBI:
-    def __init__(self,block_size):
+    def __init__(self,block_size=None,block_bytes=None,merge_buffer_size=DEFAULT_BUFFER_SIZE,max_open_files=None,memory_budget=None,tolerance=0.1,compression=None,tokenizer="split",fields=DEFAULT_FIELDS):
+        if block_bytes is not None:
+            block_size=block_bytes_to_postings(block_bytes)
+        if not block_size and not memory_budget:
+            raise ValueError("BSBI needs a block_size (postings), a block_bytes size or a memory_budget")
         self.block_size=block_size
-        self.block_dictionary=defaultdict(list)
-        self.final_dictionary=defaultdict(list)
+        # With a memory budget, block sizes adapt to what the growing term
+        # dictionary leaves over instead of using a fixed block_size.
+        self.memory_budget=memory_budget
+        self.tolerance=tolerance
+        self.compression=compression
+        self.tokenizer=get_tokenizer(tokenizer)
+        self.fields=fields
+        self.budget=None
+        self.block_sizes=[]
+        self.term_dictionary=TermDictionary()
+        self.merge_buffer_size=merge_buffer_size
+        self.max_open_files=max_open_files
+        self.merge_passes=0
+        self.block_files=[]
+        self.bytes_written=0
+        self.bytes_read=0
         
         if not os.path.exists("experiment3/writtenBlocks"):
             os.makedirs("experiment3/writtenBlocks")
+    
+    def blockCapacity(self):
+        if not self.memory_budget:
+            return self.block_size
+        available=max(0,block_budget(self.memory_budget)-self.term_dictionary.size_bytes)
+        if self.budget:
+            available=self.budget.blockBytes(available)
+        return max(MIN_BLOCK_POSTINGS,available//BSBI_POSTING_BYTES)
+    
+    def allocateBlock(self):
+        capacity=self.blockCapacity()
+        return array("I",[0])*capacity, array("I",[0])*capacity
+    
+    def handOffBlock(self, termIDs, docIDs, length):
+        self.block_sizes.append(length)
+        count("tokens",length)
+        # The arrays are never written again once handed off; the parser
+        # allocates fresh ones for the next block, so a consumer holding on to
+        # a block never sees it change underneath it.
+        return Block(memoryview(termIDs)[:length].toreadonly(), memoryview(docIDs)[:length].toreadonly())
         
-    def parseBlocks(self):
-        with open("Assignment-data/bsbi_docs.json","r") as file:
-            for obj in ijson.items(file,"item"):
-                docID=obj.get("Index")
-                for field in ["Title","Abstract"]:
-                    for word in obj[field].split():
-                        self.block_dictionary[word].append(docID)
+    def parseBlocks(self, filepath="Assignment-data/bsbi_docs.json"):
+        termIDs, docIDs = self.allocateBlock()
+        capacity=len(termIDs)
+        known_terms=len(self.term_dictionary)
+        length=0
+        with DocumentStoreWriter("experiment3/writtenBlocks") as documents_out:
+            for docID, title, texts in iterDocuments(filepath,self.fields):
+                documents_out.add(docID,title)
+                count("docs")
+                for text in texts:
+                    words=self.tokenizer.tokenize(text)
+                    # Sampled RSS near the budget cuts the block early.
+                    if self.budget and self.budget.addPostings(len(words)) and length:
+                        yield self.handOffBlock(termIDs, docIDs, length)
+                        termIDs, docIDs = self.allocateBlock()
+                        capacity=len(termIDs)
+                        length=0
+                    for word in words:
+                        termIDs[length]=self.term_dictionary.get_id(word)
+                        docIDs[length]=docID
+                        length+=1
+                        
+                        # New terms eat into the budget, so the current block
+                        # may have to be cut short.
+                        if self.memory_budget and len(self.term_dictionary)!=known_terms:
+                            known_terms=len(self.term_dictionary)
+                            capacity=min(capacity,self.blockCapacity())
 
-                        if len(self.block_dictionary) == self.block_size:
-                            yield self.block_dictionary
-                            self.block_dictionary.clear()
+                        if length >= capacity:
+                            yield self.handOffBlock(termIDs, docIDs, length)
+                            termIDs, docIDs = self.allocateBlock()
+                            capacity=len(termIDs)
+                            length=0
                     
-            if self.block_dictionary:
-                yield self.block_dictionary
+        if length:
+            yield self.handOffBlock(termIDs, docIDs, length)
                 
     def BSBIInvert(self, block):
         postings_block=defaultdict(list)
         
-        for termID, docID in sorted(block.items()):
-            postings_block[termID].extend(docID)
+        # Sort the pairs as packed 64-bit (termID, docID) keys.
+        for key in sorted((termID<<32)|docID for termID, docID in zip(block.termIDs, block.docIDs)):
+            termID, docID = key>>32, key&0xFFFFFFFF
+            postings=postings_block[termID]
+            if not postings or postings[-1]!=docID:
+                postings.append(docID)
             
         return postings_block
     
-    def mergeBase(self, block1, block2):
-        mergedBlock=defaultdict(list)
-        
-        termSet = set(block1.keys()) | set(block2.keys())
-        
-        for term in termSet:
-            postings1 = block1.get(term,[])
-            postings2 = block2.get(term,[])
-            
-            i,j=0,0
-            mergedPostings = []
-            
-            while i<len(postings1) and j<len(postings2):
-                if postings1[i]<postings2[j]:
-                    mergedPostings.append(postings1[i])
-                    i+=1
-                elif postings1[i]==postings2[j]:
-                    mergedPostings.append(postings1[i])
-                    i+=1
-                    j+=1
-                else:
-                    mergedPostings.append(postings2[j])
-                    j += 1
-                    
-            mergedPostings.extend(postings1[i:])
-            mergedPostings.extend(postings2[j:])
-            
-            mergedBlock[term]=mergedPostings
-        
-        return mergedBlock
-        
-    def mergeRecursive(self, blocks, left, right):
-            if left==right:
-                return self.readBlock(blocks[left])
-            
-            if left+1==right:
-                block_1=self.readBlock(blocks[left])
-                block_2=self.readBlock(blocks[right])
-                return self.mergeBase(block_1,block_2)
-            
-            middle=(left+right)//2
-            left_block=self.mergeRecursive(blocks,left,middle)
-            right_block=self.mergeRecursive(blocks,middle+1,right)
-            
-            return self.mergeBase(left_block,right_block)
-    
     def mergeBlocks(self,dirpath):
+        # Only merge this run's blocks: termIDs are meaningless across runs.
+        blocks = [os.path.join(dirpath,file) for file in self.block_files]
+        buffer_size, max_open_files = self.merge_buffer_size, self.max_open_files
+        if self.memory_budget:
+            # The term dictionary stays resident, so the merge gets the rest.
+            buffer_size, max_open_files = merge_plan(self.blockCapacity()*BSBI_POSTING_BYTES,len(blocks),buffer_size,max_open_files)
         
-        blocks = [file for file in os.listdir(dirpath) if file.startswith("block") and file.endswith('.txt')]
-        
-        blocks.sort()
-        self.final_dictionary=self.mergeRecursive(blocks,0,len(blocks)-1)
-        
-        #write final_dictionary to file_out
-        with open(f"experiment3/writtenBlocks/blockMerged.txt","w+") as dict_out:
-            for term, postings in sorted(self.final_dictionary.items()):
-                dict_out.write(f"{term}:{','.join(map(str, postings))}\n")
+        # Merged postings go straight to the output file(s) in term order.
+        _, bytes_read, self.merge_passes = merge_index(blocks, dirpath, self.compression, max_open_files, buffer_size)
+        self.bytes_read+=bytes_read
+        count("bytes_read",bytes_read)
+        self.term_dictionary.write(os.path.join(dirpath,"termDictionary.txt"))
             
     def writeBlockToDisk(self,blockID,postings_block):
-        with open(f"experiment3/writtenBlocks/block{blockID}size{self.block_size}.txt","w+") as file_out:
-            for term, postings in sorted(postings_block.items()):
-                file_out.write(f"{term}:{','.join(map(str, postings))}\n")
+        filename=f"block{blockID}size{self.block_size}.run" if self.block_size else f"block{blockID}budget{self.memory_budget}.run"
+        self.block_files.append(filename)
+        # Blocks are inverted by termID but written in term order, so the
+        # merged index comes out alphabetical like SPIMI's.
+        terms=sorted((self.term_dictionary.term(termID), postings) for termID, postings in postings_block.items())
+        with RunWriter(f"experiment3/writtenBlocks/{filename}",key_kind=TERM_KEYS) as run_out:
+            for term, postings in terms:
+                run_out.write(term, postings)
+                count("postings_written",len(postings))
+        self.bytes_written+=run_out.bytes_written
+        count("bytes_written",run_out.bytes_written)
             
-    def readBlock(self, filepath):
-        block=defaultdict(list)
-        with open(os.path.join("experiment3/writtenBlocks/",filepath),"r") as file:
-            for line in file:
-                term, postings = line.strip().split(":",1)
-                block[term] = postings.split(",") if postings else []
-        return block
-    
-    def BSBIndexConstruction(self):
-        start_time=time.time()
-        process=psutil.Process(os.getpid())
-        
-        init_mem=process.memory_info().rss / (1024 * 1024)
-        
-        i=0
-        for block in self.parseBlocks():
-            postings_block=self.BSBIInvert(block)
-            self.writeBlockToDisk(i,postings_block)
-            i += 1
-        
-        self.mergeBlocks("experiment3/writtenBlocks")
-        
-        final_mem=process.memory_info().rss / (1024 * 1024)
-        end_time=time.time()
+    def memory_structures(self, report, prefix="exp3"):
+        report.add(f"{prefix} term dictionary (estimated {self.term_dictionary.size_bytes/(1024*1024):.3f} MB)", self.term_dictionary)
+
+    def BSBIndexConstruction(self, filepath="Assignment-data/bsbi_docs.json"):
+        if self.memory_budget:
+            loadReaders(self.tokenizer)
+            self.budget=MemoryBudget(self.memory_budget,self.tolerance)
         
-        time_taken=end_time-start_time
-        mem_used=final_mem-init_mem
+        # Parsing runs inside the generator, so it shows up as the build
+        # span's self time next to the invert/write/merge spans.
+        with span("bsbi.build") as build_span:
+            # Runs of earlier or aborted builds would only pile up.
+            remove_runs("experiment3/writtenBlocks")
+            try:
+                i=0
+                for block in self.parseBlocks(filepath):
+                    with span("invert"):
+                        postings_block=self.BSBIInvert(block)
+                    if self.budget:
+                        self.budget.sampleRSS()
+                    with span("write_block"):
+                        self.writeBlockToDisk(i,postings_block)
+                    # Drop the written block before the next one is inverted.
+                    del block, postings_block
+                    i += 1
+            
+                with span("merge"):
+                    self.mergeBlocks("experiment3/writtenBlocks")
+                if self.budget:
+                    self.budget.sampleRSS()
+            finally:
+                remove_runs("experiment3/writtenBlocks")
         
-        print(f"Block Size: {self.block_size} | Time Taken: {time_taken:.2f} sec | Memory Used: {mem_used:.2f} MB\n")
+        time_taken=build_span.seconds
+        if self.budget:
+            sizing=f"Adaptive blocks: {min(self.block_sizes,default=0)}-{max(self.block_sizes,default=0)} postings | {self.budget.summary()}"
+        else:
+            sizing=f"Block Size: {self.block_size} postings"
+        print(f"{sizing} | Terms: {len(self.term_dictionary)} | Time Taken: {time_taken:.4f} sec | {build_span.memory_summary()} | Block I/O: {self.bytes_written/1024:.1f} KB written, {self.bytes_read/1024:.1f} KB read | Merge passes: {self.merge_passes}\n")
+        return time_taken
+
+def compareConstructions(filepaths, memory_budget, workers=None):
+    # Every build sizes its blocks from the same byte budget (the pipelined
+    # build splits it across the batches it keeps in flight), and tracemalloc
+    # measures the peak of each build (for the pipelined build that is the
+    # parent process only).
+    if not get_tracer().memory:
+        start_run("experiment3.compare",memory=True)
+    rows=[]
+    for filepath in filepaths:
+        for mode in ["bsbi","pipelined","spimi"]:
+            with span("compare",mode=mode,corpus=filepath) as build_span:
+                if mode=="bsbi":
+                    indexer=BSBI(memory_budget=memory_budget)
+                    indexer.BSBIndexConstruction(filepath)
+                elif mode=="pipelined":
+                    indexer=PipelinedBSBI(workers=workers,memory_budget=memory_budget)
+                    indexer.BSBIndexConstruction(filepath)
+                else:
+                    indexer=SPIMI(memory_budget)
+                    indexer.SPIMIndexConstruction(filepath)
+            rows.append((os.path.basename(filepath),mode,build_span.seconds,build_span.peak_bytes/(1024*1024),len(indexer.block_files),indexer.bytes_written/1024))
+    
+    print(f"{'Corpus':<24} {'Mode':<9} {'Time (s)':>9} {'Peak (MB)':>10} {'Blocks':>7} {'Runs (KB)':>10}")
+    for corpus, mode, time_taken, peak, blocks, run_kb in rows:
+        print(f"{corpus:<24} {mode:<9} {time_taken:>9.2f} {peak:>10.2f} {blocks:>7} {run_kb:>10.1f}")
 
 if __name__=="__main__":
-    for block_size in [200,10000]:
-        bsbi=BSBI(block_size)
-        bsbi.BSBIndexConstruction()
-    
\ No newline at end of file
+    parser=argparse.ArgumentParser(description="Build the experiment3 block-merged index with BSBI or SPIMI.")
+    parser.add_argument("--mode",choices=["bsbi","pipelined","spimi","compare"],default="bsbi")
+    parser.add_argument("--docs",nargs="+",default=["Assignment-data/bsbi_docs.json"],help="corpus file(s); compare mode runs every one")
+    parser.add_argument("--block-sizes",nargs="+",type=int,default=[10000,100000],help="BSBI block sizes in postings")
+    parser.add_argument("--memory-budget",type=float,default=None,help="block memory budget in MB; BSBI and the pipelined build then size blocks from it instead of using --block-sizes (default for SPIMI and compare: 16)")
+    parser.add_argument("--tolerance",type=float,default=0.1,help="allowed peak RSS overshoot of the memory budget, as a fraction; the build fails beyond it")
+    parser.add_argument("--compress",choices=sorted(CODECS),default=None,help="also write blockMerged.idx/.dict, a compressed index with skip pointers")
+    parser.add_argument("--workers",type=int,default=None,help="worker processes for the pipelined mode (default: all cores)")
+    parser.add_argument("--tokenizer",choices=sorted(TOKENIZERS),default="split",help="term tokenizer; spacy matches experiment1's lemmatizer")
+    parser.add_argument("--fields",nargs="+",default=DEFAULT_FIELDS,help="document fields to index")
+    parser.add_argument("--retrieval-index",action="store_true",help="build the index experiment1's BooleanRetrieval loads with --index (spacy tokenizer, all fields, vbyte compression)")
+    add_trace_arguments(parser)
+    args=parser.parse_args()
+    trace_path=configure_from_args(args,"experiment3")
+    
+    if args.retrieval_index:
+        args.tokenizer="spacy"
+        args.fields=RETRIEVAL_FIELDS
+        args.compress=args.compress or "vbyte"
+    try:
+        get_tokenizer(args.tokenizer)
+    except FileNotFoundError as error:
+        parser.error(str(error))
+    options={"compression":args.compress,"tokenizer":args.tokenizer,"fields":args.fields}
+    
+    memory_budget=int((args.memory_budget or 16)*1024*1024)
+    try:
+        if args.mode=="compare":
+            compareConstructions(args.docs,memory_budget,args.workers)
+        else:
+            for filepath in args.docs:
+                if args.mode=="spimi":
+                    SPIMI(memory_budget,tolerance=args.tolerance,**options).SPIMIndexConstruction(filepath)
+                elif args.mode=="pipelined" and args.memory_budget:
+                    PipelinedBSBI(workers=args.workers,memory_budget=memory_budget,**options).BSBIndexConstruction(filepath)
+                elif args.mode=="pipelined":
+                    for block_size in args.block_sizes:
+                        PipelinedBSBI(block_size,args.workers,**options).BSBIndexConstruction(filepath)
+                elif args.memory_budget:
+                    BSBI(memory_budget=memory_budget,tolerance=args.tolerance,**options).BSBIndexConstruction(filepath)
+                else:
+                    for block_size in args.block_sizes:
+                        bsbi=BSBI(block_size,**options)
+                        bsbi.BSBIndexConstruction(filepath)
+    except MemoryBudgetExceeded as error:
+        # Blocks were already at their smallest; the budget is below what
+        # this corpus needs.
+        print(f"Error: the build exceeded its memory budget even with the smallest blocks. {error}")
+        sys.exit(1)
+    
+    if trace_path:
+        get_tracer().report()
+        write_trace(trace_path)
@@ -0,0 +1,26 @@
+"""Elias-gamma coding of positive integers, packed MSB-first into bytes.
+
+A number n >= 1 is written as floor(log2 n) zero bits followed by n in
+binary.  Bit strings are built and parsed with str operations, which is far
+faster in CPython than shifting bits one at a time.
+"""
+
+
+def encode_gamma(numbers):
+    bits = "".join("0" * (number.bit_length() - 1) + format(number, "b") for number in numbers)
+    if not bits:
+        return b""
+    bits += "0" * (-len(bits) % 8)
+    return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+
+def decode_gamma(data, count):
+    bits = format(int.from_bytes(data, "big"), "b").zfill(len(data) * 8)
+    numbers = []
+    pos = 0
+    for _ in range(count):
+        one = bits.index("1", pos)
+        width = one - pos
+        numbers.append(int(bits[one:one + width + 1], 2))
+        pos = one + width + 1
+    return numbers
@@ -0,0 +1,116 @@
+"""External k-way merge of BSBI run files.
+
+Every run is read through its own bounded RunReader buffer and a heap keyed
+on the record key (a termID or the term itself) picks the next term, so
+memory use is O(k * buffer_size) no matter how large the runs are.  Every
+index builder writes term-keyed runs and finishes with merge_index, so
+they all produce the same, alphabetically ordered merged index.
+"""
+import heapq
+import os
+
+from .postings import MergedIndexWriter
+from .runs import DEFAULT_BUFFER_SIZE, TERM_KEYS, TERMID_KEYS, RunReader, RunWriter
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def default_max_open_files(reserve=16):
+    if resource is None:
+        return 256
+    soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit == resource.RLIM_INFINITY:
+        return 1024
+    return max(2, soft_limit - reserve)
+
+
+def merge_postings(postings_lists):
+    if len(postings_lists) == 1:
+        return postings_lists[0]
+    merged = []
+    for docID in heapq.merge(*postings_lists):
+        if not merged or merged[-1] != docID:
+            merged.append(docID)
+    return merged
+
+
+def merge_runs(run_paths, sink, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Merge run files, calling sink(key, postings) in key order.
+
+    Returns the number of bytes read from the runs.
+    """
+    readers = [RunReader(path, buffer_size) for path in run_paths]
+    try:
+        heap = []
+        for i, reader in enumerate(readers):
+            record = reader.next_record()
+            if record is not None:
+                heap.append((record[0], i, record[1]))
+        heapq.heapify(heap)
+
+        while heap:
+            key = heap[0][0]
+            postings_lists = []
+            while heap and heap[0][0] == key:
+                _, i, postings = heapq.heappop(heap)
+                postings_lists.append(postings)
+                record = readers[i].next_record()
+                if record is not None:
+                    heapq.heappush(heap, (record[0], i, record[1]))
+            sink(key, merge_postings(postings_lists))
+    finally:
+        for reader in readers:
+            reader.close()
+    return sum(reader.bytes_read for reader in readers)
+
+
+def merge_runs_multipass(run_paths, sink, tmp_dir, max_open_files=None, buffer_size=DEFAULT_BUFFER_SIZE, key_kind=TERMID_KEYS):
+    """Merge any number of runs while keeping at most max_open_files open.
+
+    While there are more runs than that, groups of runs are merged into
+    intermediate run files in tmp_dir, which are deleted once consumed.
+    Returns (bytes_read, number_of_passes).
+    """
+    max_open_files = max(2, max_open_files or default_max_open_files())
+    run_paths = list(run_paths)
+    bytes_read = 0
+    passes = 1
+    intermediate = set()
+
+    while len(run_paths) > max_open_files:
+        next_paths = []
+        for group_start in range(0, len(run_paths), max_open_files):
+            group = run_paths[group_start:group_start + max_open_files]
+            if len(group) == 1:
+                next_paths.extend(group)
+                continue
+            output_path = os.path.join(tmp_dir, f"pass{passes}_{group_start // max_open_files}.run")
+            with RunWriter(output_path, buffer_size, key_kind) as run_out:
+                bytes_read += merge_runs(group, run_out.write, buffer_size)
+            for path in group:
+                if path in intermediate:
+                    os.remove(path)
+                    intermediate.discard(path)
+            intermediate.add(output_path)
+            next_paths.append(output_path)
+        run_paths = next_paths
+        passes += 1
+
+    bytes_read += merge_runs(run_paths, sink, buffer_size)
+    for path in intermediate:
+        os.remove(path)
+    return bytes_read, passes
+
+
+def merge_index(run_paths, output_dir, compression=None, max_open_files=None, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Merge term-keyed runs into output_dir's blockMerged.txt (and the
+    compressed index, if compression names a codec).
+
+    Returns (term_count, bytes_read, number_of_passes).
+    """
+    with MergedIndexWriter(output_dir, compression, buffer_size) as index_out:
+        bytes_read, passes = merge_runs_multipass(run_paths, index_out.write, output_dir, max_open_files, buffer_size, TERM_KEYS)
+    return index_out.term_count, bytes_read, passes
@@ -0,0 +1,184 @@
+"""Pipelined, multi-core block construction.
+
+A reader stage streams the corpus and cuts it into document batches, a pool
+of worker processes tokenizes and inverts batches in parallel, and a writer
+thread flushes inverted blocks to disk while the next ones are being built.
+Workers cannot share BSBI's global term dictionary, so they sort
+(term, docID) pairs and the blocks are written as term-keyed runs.
+
+Every hand-off is bounded: at most ``workers + queue_depth`` batches are in
+flight in the pool and at most ``queue_depth`` inverted blocks wait for the
+writer, so memory stays capped however large the corpus is.  With a memory
+budget, the batch size is the budget shared out over every batch that can be
+alive at once.
+"""
+from collections import deque
+import os
+import queue
+import threading
+
+from common.instrumentation import count, span
+from experiment1.tokenizers import get_tokenizer
+
+from .budget import BSBI_POSTING_BYTES, MIN_BLOCK_POSTINGS, merge_plan
+from .corpus import DEFAULT_FIELDS, iterDocuments
+from .docstore import DocumentStoreWriter
+from .merge import merge_index
+from .runs import DEFAULT_BUFFER_SIZE, TERM_KEYS, RunWriter, remove_runs
+
+
+def invertBatch(docs, tokenizer="split"):
+    # The tokenizer travels by name; each worker builds (and caches) its own.
+    tokenizer=get_tokenizer(tokenizer)
+    pairs=[]
+    for docID, fields in docs:
+        for text in fields:
+            for term in tokenizer.tokenize(text):
+                pairs.append((term,docID))
+    pairs.sort()
+    
+    block=[]
+    for term, docID in pairs:
+        if block and block[-1][0]==term:
+            postings=block[-1][1]
+            if postings[-1]!=docID:
+                postings.append(docID)
+        else:
+            block.append((term,[docID]))
+    return block
+
+class PipelinedBSBI:
+    def __init__(self,block_size=100000,workers=None,queue_depth=2,merge_buffer_size=DEFAULT_BUFFER_SIZE,max_open_files=None,output_dir="experiment3/writtenBlocks",memory_budget=None,compression=None,tokenizer="split",fields=DEFAULT_FIELDS):
+        self.compression=compression
+        self.tokenizer=tokenizer
+        self.fields=fields
+        self.workers=workers or os.cpu_count() or 1
+        self.queue_depth=queue_depth
+        self.memory_budget=memory_budget
+        if memory_budget:
+            # Batches are sized with BSBI's per-posting cost and the budget is
+            # split across all of them, not granted to each one.
+            block_size=max(MIN_BLOCK_POSTINGS,memory_budget//self.inFlightBlocks()//BSBI_POSTING_BYTES)
+        self.block_size=block_size
+        self.writer_error=None
+        self.merge_buffer_size=merge_buffer_size
+        self.max_open_files=max_open_files
+        self.output_dir=output_dir
+        self.block_files=[]
+        self.bytes_written=0
+        self.bytes_read=0
+        self.merge_passes=0
+        self.term_count=0
+        
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+    
+    def inFlightBlocks(self):
+        # Submitted to the pool, waiting in the writer queue and being written.
+        return self.workers+2*self.queue_depth+1
+    
+    def readBatches(self, filepath):
+        # Cut batches at roughly block_size tokens; whitespace counting is
+        # much cheaper than splitting here, the real split happens in workers.
+        batch=[]
+        tokens=0
+        with DocumentStoreWriter(self.output_dir) as documents_out:
+            for docID, title, fields in iterDocuments(filepath,self.fields):
+                documents_out.add(docID,title)
+                count("docs")
+                batch.append((docID,fields))
+                tokens+=sum(text.count(" ")+1 for text in fields)
+                if tokens>=self.block_size:
+                    yield batch
+                    batch=[]
+                    tokens=0
+        if batch:
+            yield batch
+    
+    def writeBlocks(self, blocks):
+        try:
+            while True:
+                item=blocks.get()
+                if item is None:
+                    return
+                blockID, block=item
+                filename=f"pipelinedBlock{blockID}.run"
+                # Runs on the writer thread, so this is a root span of its own.
+                with span("pipelined.write_block"):
+                    with RunWriter(os.path.join(self.output_dir,filename),key_kind=TERM_KEYS) as run_out:
+                        for term, postings in block:
+                            run_out.write(term,postings)
+                            count("postings_written",len(postings))
+                    count("bytes_written",run_out.bytes_written)
+                self.bytes_written+=run_out.bytes_written
+                self.block_files.append(filename)
+        except BaseException as error:
+            # Re-raised on the main thread once the writer has been joined.
+            self.writer_error=error
+    
+    def handOff(self, blocks, writer, item):
+        # A dead writer never drains the queue again, so a plain put could
+        # block forever once it fills up.
+        while writer.is_alive():
+            try:
+                blocks.put(item,timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise self.writer_error or RuntimeError("the block writer stopped before the build finished")
+    
+    def invertBlocks(self, filepath, blocks, writer):
+        # multiprocessing is slow to import; only pipelined builds need it.
+        from concurrent.futures import ProcessPoolExecutor
+        blockID=0
+        pending=deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for batch in self.readBatches(filepath):
+                pending.append(pool.submit(invertBatch,batch,self.tokenizer))
+                if len(pending)>=self.workers+self.queue_depth:
+                    self.handOff(blocks,writer,(blockID,pending.popleft().result()))
+                    blockID+=1
+            while pending:
+                self.handOff(blocks,writer,(blockID,pending.popleft().result()))
+                blockID+=1
+    
+    def mergeBlocks(self):
+        blocks=[os.path.join(self.output_dir,file) for file in self.block_files]
+        buffer_size, max_open_files=self.merge_buffer_size, self.max_open_files
+        if self.memory_budget:
+            buffer_size, max_open_files=merge_plan(self.memory_budget,len(blocks),buffer_size,max_open_files)
+        
+        self.term_count, bytes_read, self.merge_passes = merge_index(blocks, self.output_dir, self.compression, max_open_files, buffer_size)
+        self.bytes_read+=bytes_read
+        count("bytes_read",bytes_read)
+    
+    def BSBIndexConstruction(self, filepath="Assignment-data/bsbi_docs.json"):
+        with span("pipelined.build") as build_span:
+            # Runs of earlier or aborted builds would only pile up.
+            remove_runs(self.output_dir)
+            try:
+                # The bounded queue double-buffers the writer: one block is being
+                # written while the next one waits, and workers stall beyond that.
+                blocks=queue.Queue(maxsize=self.queue_depth)
+                self.writer_error=None
+                writer=threading.Thread(target=self.writeBlocks,args=(blocks,))
+                writer.start()
+                try:
+                    with span("invert"):
+                        self.invertBlocks(filepath,blocks,writer)
+                finally:
+                    if writer.is_alive():
+                        self.handOff(blocks,writer,None)
+                    writer.join()
+                if self.writer_error:
+                    raise self.writer_error
+            
+                with span("merge"):
+                    self.mergeBlocks()
+            finally:
+                remove_runs(self.output_dir)
+        
+        time_taken=build_span.seconds
+        sizing=f"Budget: {self.memory_budget/(1024*1024):.2f} MB over {self.inFlightBlocks()} batches | " if self.memory_budget else ""
+        print(f"Pipelined {sizing}Block Size: {self.block_size} postings | Workers: {self.workers} | Blocks: {len(self.block_files)} | Terms: {self.term_count} | Time Taken: {time_taken:.4f} sec | {build_span.memory_summary()} | Block I/O: {self.bytes_written/1024:.1f} KB written, {self.bytes_read/1024:.1f} KB read | Merge passes: {self.merge_passes}\n")
+        return time_taken
@@ -0,0 +1,360 @@
+"""Compressed final index with skip pointers, and intersection on it.
+
+``blockMerged.idx`` holds one postings blob per term and ``blockMerged.dict``
+maps each term to its document frequency, offset and blob length, so a
+reader only touches the lists a query needs.
+
+A blob is split into chunks of ceil(sqrt(df)) postings.  Its header is the
+variable-byte encoded df and chunk count and, per chunk, the gap between
+the chunk's last docID and the previous chunk's last docID plus the chunk's
+byte length: these are the skip pointers.  Each chunk's docIDs are coded as
+gaps from the previous chunk's last docID (-1 before the first chunk, so
+every gap is >= 1), with either variable-byte or Elias-gamma codes; gamma
+chunks are padded to a byte boundary so chunks can be decoded on their own.
+"""
+from bisect import bisect_left
+import math
+import os
+
+from .gamma import decode_gamma, encode_gamma
+from .runs import DEFAULT_BUFFER_SIZE
+from .vbyte import decode_gaps, decode_number, encode_gaps, encode_number
+
+MAGIC = b"BSBX"
+CODECS = {"vbyte": 0, "gamma": 1}
+
+
+def chunk_size(df):
+    return max(1, math.isqrt(df - 1) + 1) if df > 1 else 1
+
+
+def encode_postings(postings, codec="vbyte"):
+    size = chunk_size(len(postings))
+    header = bytearray()
+    encode_number(len(postings), header)
+    chunk_count = (len(postings) + size - 1) // size
+    encode_number(chunk_count, header)
+
+    payload = bytearray()
+    previous = -1
+    for start in range(0, len(postings), size):
+        chunk = postings[start:start + size]
+        if codec == "gamma":
+            gaps = [docID - prev for prev, docID in zip([previous] + chunk[:-1], chunk)]
+            encoded = encode_gamma(gaps)
+        else:
+            encoded = bytearray()
+            encode_gaps(chunk, encoded, previous)
+        encode_number(chunk[-1] - previous, header)
+        encode_number(len(encoded), header)
+        payload += encoded
+        previous = chunk[-1]
+    return bytes(header + payload)
+
+
+class PostingsList:
+    def __init__(self, data, codec="vbyte"):
+        self.data = data
+        self.codec = codec
+        pos = 0
+        self.df, pos = decode_number(data, pos)
+        chunk_count, pos = decode_number(data, pos)
+        self.chunk_last = []
+        lengths = []
+        last = -1
+        for _ in range(chunk_count):
+            gap, pos = decode_number(data, pos)
+            last += gap
+            self.chunk_last.append(last)
+            length, pos = decode_number(data, pos)
+            lengths.append(length)
+        self.chunk_offsets = []
+        for length in lengths:
+            self.chunk_offsets.append(pos)
+            pos += length
+        self.chunk_offsets.append(pos)
+        self.size = chunk_size(self.df)
+        self.chunks_decoded = 0
+
+    def __len__(self):
+        return self.df
+
+    def chunk(self, i):
+        self.chunks_decoded += 1
+        start, end = self.chunk_offsets[i], self.chunk_offsets[i + 1]
+        previous = self.chunk_last[i - 1] if i else -1
+        count = min(self.size, self.df - i * self.size)
+        if self.codec == "gamma":
+            docIDs = []
+            for gap in decode_gamma(self.data[start:end], count):
+                previous += gap
+                docIDs.append(previous)
+            return docIDs
+        return decode_gaps(self.data, start, end, count, previous)
+
+    def __iter__(self):
+        for i in range(len(self.chunk_last)):
+            yield from self.chunk(i)
+
+    def cursor(self):
+        return PostingsCursor(self)
+
+
+class PostingsCursor:
+    """Forward-only cursor over a compressed list, decoding one chunk at a time."""
+
+    def __init__(self, postings):
+        self.postings = postings
+        self.chunk_index = 0
+        self.docs = postings.chunk(0) if postings.df else []
+        self.i = 0
+
+    @property
+    def exhausted(self):
+        return self.i >= len(self.docs)
+
+    @property
+    def doc(self):
+        return self.docs[self.i]
+
+    def _load(self, chunk_index):
+        self.chunk_index = chunk_index
+        if chunk_index < len(self.postings.chunk_last):
+            self.docs = self.postings.chunk(chunk_index)
+        else:
+            self.docs = []
+        self.i = 0
+
+    def advance(self):
+        self.i += 1
+        if self.i == len(self.docs) and self.chunk_index + 1 < len(self.postings.chunk_last):
+            self._load(self.chunk_index + 1)
+
+    def seek(self, target):
+        # Follow skip pointers past whole chunks that end before target,
+        # then scan linearly inside the chunk.
+        chunk_last = self.postings.chunk_last
+        c = self.chunk_index
+        if chunk_last[c] < target:
+            while c < len(chunk_last) and chunk_last[c] < target:
+                c += 1
+            self._load(c)
+            if self.exhausted:
+                return
+        while self.docs[self.i] < target:
+            self.i += 1
+
+    def gallop(self, target):
+        # Exponential search over the chunk maxima, then binary search inside
+        # the chunk that can hold target.
+        chunk_last = self.postings.chunk_last
+        c = self.chunk_index
+        if chunk_last[c] < target:
+            step = 1
+            low = c
+            high = c + 1
+            while high < len(chunk_last) and chunk_last[high] < target:
+                low = high
+                step *= 2
+                high = c + step
+            c = bisect_left(chunk_last, target, low, min(high + 1, len(chunk_last)))
+            self._load(c)
+            if self.exhausted:
+                return
+        self.i = bisect_left(self.docs, target, self.i)
+
+
+class ListCursor:
+    """The PostingsCursor interface over an uncompressed sorted list."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.i = 0
+
+    @property
+    def exhausted(self):
+        return self.i >= len(self.docs)
+
+    @property
+    def doc(self):
+        return self.docs[self.i]
+
+    def advance(self):
+        self.i += 1
+
+    def seek(self, target):
+        while self.i < len(self.docs) and self.docs[self.i] < target:
+            self.i += 1
+
+    def gallop(self, target):
+        step = 1
+        high = self.i
+        while high < len(self.docs) and self.docs[high] < target:
+            high = self.i + step
+            step *= 2
+        self.i = bisect_left(self.docs, target, self.i, min(high + 1, len(self.docs)))
+
+
+def cursor(postings):
+    return postings.cursor() if isinstance(postings, PostingsList) else ListCursor(postings)
+
+
+def intersect_lists(postings1, postings2):
+    """Uncompressed baseline: the classic linear merge."""
+    i, j = 0, 0
+    result = []
+    while i < len(postings1) and j < len(postings2):
+        if postings1[i] == postings2[j]:
+            result.append(postings1[i])
+            i += 1
+            j += 1
+        elif postings1[i] < postings2[j]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def intersect_skip(postings1, postings2):
+    cursor1, cursor2 = cursor(postings1), cursor(postings2)
+    result = []
+    while not cursor1.exhausted and not cursor2.exhausted:
+        doc1, doc2 = cursor1.doc, cursor2.doc
+        if doc1 == doc2:
+            result.append(doc1)
+            cursor1.advance()
+            cursor2.advance()
+        elif doc1 < doc2:
+            cursor1.seek(doc2)
+        else:
+            cursor2.seek(doc1)
+    return result
+
+
+def intersect_galloping(postings1, postings2):
+    small, large = sorted((postings1, postings2), key=len)
+    large_cursor = cursor(large)
+    result = []
+    for docID in small:
+        large_cursor.gallop(docID)
+        if large_cursor.exhausted:
+            break
+        if large_cursor.doc == docID:
+            result.append(docID)
+    return result
+
+
+INTERSECTIONS = {"linear": intersect_lists, "skip": intersect_skip, "galloping": intersect_galloping}
+
+
+def intersect_all(postings_lists, method="galloping"):
+    """AND any number of lists, rarest first."""
+    if not postings_lists:
+        return []
+    postings_lists = sorted(postings_lists, key=len)
+    result = postings_lists[0]
+    for postings in postings_lists[1:]:
+        if not result:
+            break
+        result = INTERSECTIONS[method](result, postings)
+    return list(result)
+
+
+class CompressedIndexWriter:
+    def __init__(self, dirpath, codec="vbyte", name="blockMerged", buffer_size=DEFAULT_BUFFER_SIZE):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec '{codec}', expected one of: {', '.join(CODECS)}")
+        self.codec = codec
+        self.data_path = os.path.join(dirpath, f"{name}.idx")
+        self.dict_path = os.path.join(dirpath, f"{name}.dict")
+        self.data = open(self.data_path, "wb", buffering=buffer_size)
+        self.dictionary = open(self.dict_path, "w", encoding="utf-8", buffering=buffer_size)
+        self.data.write(MAGIC + bytes([CODECS[codec]]))
+        self.offset = len(MAGIC) + 1
+
+    def write(self, term, postings):
+        blob = encode_postings(postings, self.codec)
+        self.data.write(blob)
+        self.dictionary.write(f"{term}\t{len(postings)}\t{self.offset}\t{len(blob)}\n")
+        self.offset += len(blob)
+
+    @property
+    def size_bytes(self):
+        return os.path.getsize(self.data_path) + os.path.getsize(self.dict_path)
+
+    def close(self):
+        self.data.close()
+        self.dictionary.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CompressedIndex:
+    """Reader: the term dictionary is resident, postings are read per term."""
+
+    def __init__(self, dirpath, name="blockMerged"):
+        self.data_path = os.path.join(dirpath, f"{name}.idx")
+        self.dict_path = os.path.join(dirpath, f"{name}.dict")
+        self.dictionary = {}
+        with open(self.dict_path, "r", encoding="utf-8") as file:
+            for line in file:
+                term, df, offset, length = line.rstrip("\n").split("\t")
+                self.dictionary[term] = (int(df), int(offset), int(length))
+        self.data = open(self.data_path, "rb")
+        header = self.data.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.data_path} is not a compressed BSBI index")
+        self.codec = {code: codec for codec, code in CODECS.items()}[header[len(MAGIC)]]
+
+    def __contains__(self, term):
+        return term in self.dictionary
+
+    def __len__(self):
+        return len(self.dictionary)
+
+    def df(self, term):
+        return self.dictionary[term][0] if term in self.dictionary else 0
+
+    def postings(self, term):
+        if term not in self.dictionary:
+            return PostingsList(encode_postings([]), self.codec)
+        _, offset, length = self.dictionary[term]
+        self.data.seek(offset)
+        return PostingsList(self.data.read(length), self.codec)
+
+    @property
+    def size_bytes(self):
+        return os.path.getsize(self.data_path) + os.path.getsize(self.dict_path)
+
+    def close(self):
+        self.data.close()
+
+
+class MergedIndexWriter:
+    """Sink for the final merge: blockMerged.txt and, optionally, the compressed index."""
+
+    def __init__(self, dirpath, codec=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.text = open(os.path.join(dirpath, "blockMerged.txt"), "w+", buffering=buffer_size)
+        self.compressed = CompressedIndexWriter(dirpath, codec, buffer_size=buffer_size) if codec else None
+        self.term_count = 0
+
+    def write(self, term, postings):
+        self.term_count += 1
+        self.text.write(f"{term}:{','.join(map(str, postings))}\n")
+        if self.compressed:
+            self.compressed.write(term, postings)
+
+    def close(self):
+        self.text.close()
+        if self.compressed:
+            self.compressed.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
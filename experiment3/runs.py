@@ -0,0 +1,137 @@
+"""Binary run files written by BSBI for each inverted block.
+
+Layout: the 4-byte magic ``BSBR`` and a key-kind byte, followed by one
+record per term in increasing key order.  termID-keyed records start with
+the variable-byte encoded termID gap to the previous record; term-keyed
+records, which every index builder writes so that runs merge in term order,
+start with the length of the UTF-8 term followed by its bytes.  Then come the document frequency and the
+payload length in bytes, followed by the payload: the docIDs as
+variable-byte encoded gaps.
+"""
+from itertools import islice
+import os
+
+from .vbyte import decode_gaps, decode_number, encode_gaps, encode_number
+
+MAGIC = b"BSBR"
+TERMID_KEYS = 0
+TERM_KEYS = 1
+DEFAULT_BUFFER_SIZE = 1 << 16
+# Longest variable-byte encoding of a 64-bit integer.
+MAX_NUMBER_BYTES = 10
+
+
+class RunWriter:
+    def __init__(self, filepath, buffer_size=DEFAULT_BUFFER_SIZE, key_kind=TERMID_KEYS):
+        self.filepath = filepath
+        self.key_kind = key_kind
+        self.file = open(filepath, "wb", buffering=buffer_size)
+        self.file.write(MAGIC + bytes([key_kind]))
+        self.bytes_written = len(MAGIC) + 1
+        self.previous_key = None
+
+    def write(self, key, postings):
+        if self.previous_key is not None and key <= self.previous_key:
+            raise ValueError(f"keys must be written in increasing order ({key!r} after {self.previous_key!r})")
+        # Gaps are only encodable for strictly increasing, non-negative docIDs.
+        if postings and (postings[0] < 0 or any(later <= earlier for earlier, later in zip(postings, islice(postings, 1, None)))):
+            raise ValueError(f"postings of {key!r} must be strictly increasing non-negative docIDs")
+        payload = bytearray()
+        encode_gaps(postings, payload)
+
+        record = bytearray()
+        if self.key_kind == TERM_KEYS:
+            term = key.encode("utf-8")
+            encode_number(len(term), record)
+            record += term
+        else:
+            encode_number(key - (self.previous_key or 0), record)
+        encode_number(len(postings), record)
+        encode_number(len(payload), record)
+        record += payload
+
+        self.file.write(record)
+        self.bytes_written += len(record)
+        self.previous_key = key
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RunReader:
+    """Sequential reader over a run file holding at most ~buffer_size bytes."""
+
+    def __init__(self, filepath, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.filepath = filepath
+        self.buffer_size = buffer_size
+        self.file = open(filepath, "rb", buffering=0)
+        self.buffer = b""
+        self.pos = 0
+        self.bytes_read = 0
+        self.previous_key = 0
+        if not self._ensure(len(MAGIC) + 1) or self.buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{filepath} is not a BSBI run file")
+        self.key_kind = self.buffer[len(MAGIC)]
+        self.pos = len(MAGIC) + 1
+
+    def _ensure(self, n):
+        available = len(self.buffer) - self.pos
+        if available >= n:
+            return True
+        chunk = self.file.read(max(self.buffer_size, n - available))
+        self.bytes_read += len(chunk)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return len(self.buffer) >= n
+
+    def _read_number(self):
+        self._ensure(MAX_NUMBER_BYTES)
+        number, self.pos = decode_number(self.buffer, self.pos)
+        return number
+
+    def next_record(self):
+        if not self._ensure(1):
+            return None
+        if self.key_kind == TERM_KEYS:
+            length = self._read_number()
+            self._ensure(length)
+            key = self.buffer[self.pos:self.pos + length].decode("utf-8")
+            self.pos += length
+        else:
+            key = self.previous_key + self._read_number()
+        df = self._read_number()
+        length = self._read_number()
+        self._ensure(length)
+        postings = decode_gaps(self.buffer, self.pos, self.pos + length, df)
+        self.pos += length
+        self.previous_key = key
+        return key, postings
+
+    def __iter__(self):
+        record = self.next_record()
+        while record is not None:
+            yield record
+            record = self.next_record()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def remove_runs(dirpath):
+    """Delete every run file in dirpath; builds call it before they write
+    their blocks and once they are done with them, merged or not."""
+    for name in os.listdir(dirpath):
+        if name.endswith(".run"):
+            os.remove(os.path.join(dirpath, name))
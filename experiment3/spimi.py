@@ -0,0 +1,137 @@
+import os
+
+from common.instrumentation import count, span
+from experiment1.tokenizers import get_tokenizer
+
+from .corpus import DEFAULT_FIELDS, iterDocuments, loadReaders
+from .docstore import DocumentStoreWriter
+from .budget import SPIMI_POSTING_BYTES, MemoryBudget, block_budget, merge_plan, term_bytes
+from .merge import merge_index
+from .runs import DEFAULT_BUFFER_SIZE, TERM_KEYS, RunWriter, remove_runs
+
+DEFAULT_MEMORY_BUDGET = 16 * 1024 * 1024
+
+class SPIMI:
+    """Single-Pass In-Memory Indexing.
+
+    Terms go straight into a per-block dictionary of growing postings lists;
+    there is no global termID mapping and no (termID, docID) pair sort.  A
+    block is flushed as a term-keyed run once its estimated size reaches the
+    memory budget, and runs are merged with the same k-way merge as BSBI.
+    """
+
+    def __init__(self,memory_budget=DEFAULT_MEMORY_BUDGET,merge_buffer_size=DEFAULT_BUFFER_SIZE,max_open_files=None,output_dir="experiment3/writtenBlocks",tolerance=0.1,compression=None,tokenizer="split",fields=DEFAULT_FIELDS):
+        self.memory_budget=memory_budget
+        self.block_budget=block_budget(memory_budget)
+        self.compression=compression
+        self.tokenizer=get_tokenizer(tokenizer)
+        self.fields=fields
+        self.tolerance=tolerance
+        self.budget=None
+        self.merge_buffer_size=merge_buffer_size
+        self.max_open_files=max_open_files
+        self.output_dir=output_dir
+        self.block_files=[]
+        self.bytes_written=0
+        self.bytes_read=0
+        self.merge_passes=0
+        self.term_count=0
+        
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+    
+    def blockLimit(self):
+        return self.budget.blockBytes(self.block_budget) if self.budget else self.block_budget
+    
+    def finishBlock(self, dictionary, ordered):
+        # Appending keeps postings sorted only while documents arrive in
+        # increasing docID order; otherwise the block is put in order here.
+        if not ordered:
+            for term, postings in dictionary.items():
+                dictionary[term]=sorted(set(postings))
+        return dictionary
+    
+    def invertBlocks(self, filepath="Assignment-data/bsbi_docs.json"):
+        dictionary={}
+        used=0
+        limit=self.blockLimit()
+        ordered=True
+        previous_docID=-1
+        with DocumentStoreWriter(self.output_dir) as documents_out:
+            for docID, title, texts in iterDocuments(filepath,self.fields):
+                documents_out.add(docID,title)
+                count("docs")
+                if docID<=previous_docID:
+                    ordered=False
+                previous_docID=docID
+                for text in texts:
+                    terms=self.tokenizer.tokenize(text)
+                    count("tokens",len(terms))
+                    # Sampled RSS near the budget cuts the block early.
+                    if self.budget and self.budget.addPostings(len(terms)) and dictionary:
+                        yield self.finishBlock(dictionary,ordered)
+                        dictionary={}
+                        used=0
+                        limit=self.blockLimit()
+                        ordered=True
+                    for term in terms:
+                        postings=dictionary.get(term)
+                        if postings is None:
+                            postings=dictionary[term]=[]
+                            used+=term_bytes(term)
+                        if not postings or postings[-1]!=docID:
+                            postings.append(docID)
+                            used+=SPIMI_POSTING_BYTES
+                        
+                        if used>=limit:
+                            yield self.finishBlock(dictionary,ordered)
+                            dictionary={}
+                            used=0
+                            limit=self.blockLimit()
+                            ordered=True
+        
+        if dictionary:
+            yield self.finishBlock(dictionary,ordered)
+    
+    def writeBlockToDisk(self, blockID, dictionary):
+        filename=f"spimiBlock{blockID}.run"
+        self.block_files.append(filename)
+        with RunWriter(os.path.join(self.output_dir,filename),key_kind=TERM_KEYS) as run_out:
+            for term in sorted(dictionary):
+                run_out.write(term, dictionary[term])
+                count("postings_written",len(dictionary[term]))
+        self.bytes_written+=run_out.bytes_written
+        count("bytes_written",run_out.bytes_written)
+    
+    def mergeBlocks(self):
+        blocks=[os.path.join(self.output_dir,file) for file in self.block_files]
+        buffer_size, max_open_files=merge_plan(self.blockLimit(),len(blocks),self.merge_buffer_size,self.max_open_files)
+        
+        self.term_count, bytes_read, self.merge_passes = merge_index(blocks, self.output_dir, self.compression, max_open_files, buffer_size)
+        self.bytes_read+=bytes_read
+        count("bytes_read",bytes_read)
+    
+    def SPIMIndexConstruction(self, filepath="Assignment-data/bsbi_docs.json"):
+        loadReaders(self.tokenizer)
+        self.budget=MemoryBudget(self.memory_budget,self.tolerance)
+        
+        with span("spimi.build") as build_span:
+            # Runs of earlier or aborted builds would only pile up.
+            remove_runs(self.output_dir)
+            try:
+                for i, dictionary in enumerate(self.invertBlocks(filepath)):
+                    self.budget.sampleRSS()
+                    with span("write_block"):
+                        self.writeBlockToDisk(i,dictionary)
+                    # Otherwise the written block stays alive while the next fills.
+                    del dictionary
+            
+                with span("merge"):
+                    self.mergeBlocks()
+                self.budget.sampleRSS()
+            finally:
+                remove_runs(self.output_dir)
+        
+        time_taken=build_span.seconds
+        print(f"SPIMI {self.budget.summary()} | Blocks: {len(self.block_files)} | Terms: {self.term_count} | Time Taken: {time_taken:.4f} sec | Block I/O: {self.bytes_written/1024:.1f} KB written, {self.bytes_read/1024:.1f} KB read | Merge passes: {self.merge_passes}\n")
+        return time_taken
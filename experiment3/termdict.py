@@ -0,0 +1,42 @@
+from .budget import term_bytes
+
+
+class TermDictionary:
+    """Global term <-> termID mapping shared by every block of a BSBI run."""
+
+    def __init__(self):
+        self.term_ids = {}
+        self.terms = []
+        self.size_bytes = 0
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self.term_ids
+
+    def get_id(self, term):
+        termID = self.term_ids.get(term)
+        if termID is None:
+            termID = len(self.terms)
+            self.term_ids[term] = termID
+            self.terms.append(term)
+            self.size_bytes += term_bytes(term)
+        return termID
+
+    def term(self, termID):
+        return self.terms[termID]
+
+    def write(self, filepath):
+        # termIDs are dense, so line number i holds the term with termID i.
+        with open(filepath, "w", encoding="utf-8") as file_out:
+            for term in self.terms:
+                file_out.write(f"{term}\n")
+
+    @classmethod
+    def read(cls, filepath):
+        dictionary = cls()
+        with open(filepath, "r", encoding="utf-8") as file:
+            for line in file:
+                dictionary.get_id(line.rstrip("\n"))
+        return dictionary
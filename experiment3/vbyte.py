@@ -0,0 +1,42 @@
+"""Variable-byte (LEB128 style) integer coding used by the BSBI run files.
+
+Each integer is split into 7-bit groups, least significant first; the high
+bit of a byte is set when more bytes of the same integer follow.
+"""
+
+
+def encode_number(number, out):
+    while number >= 0x80:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def decode_number(data, pos):
+    number = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, pos
+        shift += 7
+
+
+def encode_gaps(postings, out, previous=0):
+    for docID in postings:
+        encode_number(docID - previous, out)
+        previous = docID
+
+
+def decode_gaps(data, pos=0, end=None, count=None, previous=0):
+    if end is None:
+        end = len(data)
+    postings = []
+    docID = previous
+    while pos < end and (count is None or len(postings) < count):
+        gap, pos = decode_number(data, pos)
+        docID += gap
+        postings.append(docID)
+    return postings